@@ -24,6 +24,7 @@ def load_order():
         'asn1crypto._errors',
         'asn1crypto._int',
         'asn1crypto._ordereddict',
+        'asn1crypto._cache',
         'asn1crypto._teletex_codec',
         'asn1crypto._types',
         'asn1crypto._inet',
@@ -0,0 +1,108 @@
+# coding: utf-8
+
+"""
+Exports the following items:
+
+ - BoundedCache()
+"""
+
+from __future__ import unicode_literals, division, absolute_import, print_function
+
+from ._ordereddict import OrderedDict
+
+
+class BoundedCache(object):
+    """
+    A dict-like cache that holds at most a fixed number of entries, evicting
+    the least recently used entry once full, and that counts lookup hits and
+    misses
+    """
+
+    # The maximum number of entries to hold
+    max_size = None
+
+    # The number of get() calls that found a value, and that did not
+    hits = 0
+    misses = 0
+
+    # An OrderedDict of the entries, from least to most recently used
+    _entries = None
+
+    def __init__(self, max_size):
+        """
+        :param max_size:
+            A positive integer of the maximum number of entries to hold
+
+        :raises:
+            ValueError - when max_size is less than 1
+        """
+
+        if max_size < 1:
+            raise ValueError('max_size must be at least 1, not %s' % repr(max_size))
+
+        self.max_size = max_size
+        self._entries = OrderedDict()
+
+    def get(self, key):
+        """
+        Looks up a cached value, marking it as the most recently used
+
+        :param key:
+            A hashable key
+
+        :return:
+            The cached value, or None if the key is not present
+        """
+
+        entries = self._entries
+        # OrderedDict on Python 2 has no move_to_end(), so the entry is
+        # re-inserted to make it the most recently used
+        value = entries.pop(key, None)
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+            entries[key] = value
+        return value
+
+    def set(self, key, value):
+        """
+        Adds a value to the cache, evicting the least recently used entry if
+        the cache is full
+
+        :param key:
+            A hashable key
+
+        :param value:
+            The value to cache - must not be None
+        """
+
+        entries = self._entries
+        if key not in entries and len(entries) >= self.max_size:
+            entries.popitem(last=False)
+        entries[key] = value
+
+    def clear(self):
+        """
+        Removes all entries and resets the hit and miss counters
+        """
+
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def info(self):
+        """
+        :return:
+            A dict with the keys "hits", "misses", "size" and "max_size"
+        """
+
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'size': len(self._entries),
+            'max_size': self.max_size,
+        }
+
+    def __len__(self):
+        return len(self._entries)
@@ -0,0 +1,443 @@
+/*
+ * Optional C implementations of asn1crypto.parser._parse() and
+ * asn1crypto.parser._dump_header(). The semantics and error messages must be
+ * identical to the pure-Python versions. Values that can not be represented
+ * using native integers, such as huge tag numbers or lengths, are handed off
+ * to the pure-Python implementations registered via _set_fallbacks().
+ */
+
+#define PY_SSIZE_T_CLEAN
+#include <Python.h>
+
+#if PY_MAJOR_VERSION >= 3
+#define BYTES_CHECK_EXACT PyBytes_CheckExact
+#define BYTES_FROM_STRING_AND_SIZE PyBytes_FromStringAndSize
+#define INT_CHECK(o) PyLong_Check(o)
+#else
+#define BYTES_CHECK_EXACT PyString_CheckExact
+#define BYTES_FROM_STRING_AND_SIZE PyString_FromStringAndSize
+#define INT_CHECK(o) (PyInt_Check(o) || PyLong_Check(o))
+#endif
+
+/* Must match asn1crypto.parser._MAX_DEPTH */
+#define MAX_DEPTH 10
+
+/* Tag numbers at or above this are left to the pure-Python implementation */
+#define MAX_TAG (PY_SSIZE_T_MAX >> 7)
+
+#define PARSE_OK 0
+#define PARSE_ERROR -1
+#define PARSE_FALLBACK -2
+
+static const char insufficient_data_message[] =
+    "Insufficient data - %zd bytes requested but only %zd available";
+
+static PyObject *py_parse = NULL;
+static PyObject *py_dump_header = NULL;
+static PyObject *empty_bytes = NULL;
+static PyObject *eoc_bytes = NULL;
+
+typedef struct {
+    int class_;
+    int method;
+    Py_ssize_t tag;
+    Py_ssize_t start;
+    Py_ssize_t contents_start;
+    Py_ssize_t contents_end;
+    int indefinite;
+} tlv_info;
+
+
+static int
+insufficient_data(Py_ssize_t requested, Py_ssize_t available)
+{
+    PyErr_Format(PyExc_ValueError, insufficient_data_message, requested, available);
+    return PARSE_ERROR;
+}
+
+
+/*
+ * Mirrors the logic of asn1crypto.parser._parse(), filling info instead of
+ * constructing the return value
+ */
+static int
+scan_tlv(const unsigned char *data, Py_ssize_t data_len, Py_ssize_t pointer, int depth, tlv_info *info)
+{
+    unsigned char first_octet;
+    unsigned char length_octet;
+    unsigned char num;
+    Py_ssize_t tag;
+    Py_ssize_t length;
+    Py_ssize_t length_octets;
+    Py_ssize_t contents_end;
+    Py_ssize_t i;
+    tlv_info child;
+    int result;
+
+    if (depth > MAX_DEPTH) {
+        PyErr_SetString(PyExc_ValueError, "Indefinite-length recursion limit exceeded");
+        return PARSE_ERROR;
+    }
+
+    info->start = pointer;
+    info->indefinite = 0;
+
+    if (data_len < pointer + 1) {
+        return insufficient_data(1, data_len - pointer);
+    }
+    first_octet = data[pointer];
+    pointer += 1;
+
+    tag = first_octet & 31;
+    info->class_ = first_octet >> 6;
+    info->method = (first_octet >> 5) & 1;
+
+    /* Base 128 length using 8th bit as continuation indicator */
+    if (tag == 31) {
+        tag = 0;
+        while (1) {
+            if (data_len < pointer + 1) {
+                return insufficient_data(1, data_len - pointer);
+            }
+            num = data[pointer];
+            pointer += 1;
+            if (num == 0x80 && tag == 0) {
+                PyErr_SetString(PyExc_ValueError, "Non-minimal tag encoding");
+                return PARSE_ERROR;
+            }
+            if (tag >= MAX_TAG) {
+                return PARSE_FALLBACK;
+            }
+            tag *= 128;
+            tag += num & 127;
+            if (num >> 7 == 0) {
+                break;
+            }
+        }
+        if (tag < 31) {
+            PyErr_SetString(PyExc_ValueError, "Non-minimal tag encoding");
+            return PARSE_ERROR;
+        }
+    }
+    info->tag = tag;
+
+    if (data_len < pointer + 1) {
+        return insufficient_data(1, data_len - pointer);
+    }
+    length_octet = data[pointer];
+    pointer += 1;
+
+    if (length_octet >> 7 == 0) {
+        contents_end = pointer + (length_octet & 127);
+
+    } else {
+        length_octets = length_octet & 127;
+        if (length_octets) {
+            if (data_len < pointer + length_octets) {
+                return insufficient_data(length_octets, data_len - pointer);
+            }
+            length = 0;
+            for (i = pointer; i < pointer + length_octets; i++) {
+                if (length > (PY_SSIZE_T_MAX >> 8)) {
+                    return PARSE_FALLBACK;
+                }
+                length = (length << 8) | data[i];
+            }
+            pointer += length_octets;
+            if (length > PY_SSIZE_T_MAX - pointer) {
+                return PARSE_FALLBACK;
+            }
+            contents_end = pointer + length;
+
+        } else {
+            if (!info->method) {
+                PyErr_SetString(PyExc_ValueError, "Indefinite-length element must be constructed");
+                return PARSE_ERROR;
+            }
+            contents_end = pointer;
+            while (data_len < contents_end + 2 || data[contents_end] != 0 || data[contents_end + 1] != 0) {
+                result = scan_tlv(data, data_len, contents_end, depth + 1, &child);
+                if (result != PARSE_OK) {
+                    return result;
+                }
+                contents_end = child.contents_end;
+            }
+            contents_end += 2;
+            info->indefinite = 1;
+        }
+    }
+
+    if (contents_end > data_len) {
+        return insufficient_data(contents_end - pointer, data_len - pointer);
+    }
+
+    info->contents_start = pointer;
+    info->contents_end = contents_end;
+    return PARSE_OK;
+}
+
+
+static PyObject *
+slice(PyObject *encoded_data, const unsigned char *data, Py_ssize_t start, Py_ssize_t end)
+{
+    if (BYTES_CHECK_EXACT(encoded_data)) {
+        return BYTES_FROM_STRING_AND_SIZE((const char *)data + start, end - start);
+    }
+    return PySequence_GetSlice(encoded_data, start, end);
+}
+
+
+static PyObject *
+call_fallback(PyObject *fallback, PyObject *args, PyObject *kwargs)
+{
+    if (fallback == NULL) {
+        PyErr_SetString(PyExc_RuntimeError, "asn1crypto._speedups fallbacks have not been set");
+        return NULL;
+    }
+    return PyObject_Call(fallback, args, kwargs);
+}
+
+
+static PyObject *
+speedups_parse(PyObject *self, PyObject *args, PyObject *kwargs)
+{
+    static char *kwlist[] = {"encoded_data", "data_len", "pointer", "lengths_only", "depth", NULL};
+
+    PyObject *encoded_data;
+    Py_ssize_t data_len;
+    Py_ssize_t pointer = 0;
+    PyObject *lengths_only = Py_False;
+    int depth = 0;
+    Py_buffer view;
+    tlv_info info;
+    int result;
+    int is_lengths_only;
+    PyObject *header = NULL;
+    PyObject *contents = NULL;
+    PyObject *trailer;
+    PyObject *output;
+
+    if (!PyArg_ParseTupleAndKeywords(args, kwargs, "On|nOi", kwlist,
+                                     &encoded_data, &data_len, &pointer, &lengths_only, &depth)) {
+        PyErr_Clear();
+        return call_fallback(py_parse, args, kwargs);
+    }
+
+    is_lengths_only = PyObject_IsTrue(lengths_only);
+    if (is_lengths_only < 0) {
+        return NULL;
+    }
+
+    if (PyObject_GetBuffer(encoded_data, &view, PyBUF_SIMPLE) != 0) {
+        PyErr_Clear();
+        return call_fallback(py_parse, args, kwargs);
+    }
+
+    if (pointer < 0 || data_len > view.len || view.itemsize != 1) {
+        PyBuffer_Release(&view);
+        return call_fallback(py_parse, args, kwargs);
+    }
+
+    result = scan_tlv((const unsigned char *)view.buf, data_len, pointer, depth, &info);
+
+    if (result == PARSE_FALLBACK) {
+        PyBuffer_Release(&view);
+        return call_fallback(py_parse, args, kwargs);
+    }
+    if (result == PARSE_ERROR) {
+        PyBuffer_Release(&view);
+        return NULL;
+    }
+
+    if (is_lengths_only) {
+        PyBuffer_Release(&view);
+        return Py_BuildValue("(nn)", info.contents_start, info.contents_end);
+    }
+
+    trailer = info.indefinite ? eoc_bytes : empty_bytes;
+
+    header = slice(encoded_data, (const unsigned char *)view.buf, info.start, info.contents_start);
+    if (header == NULL) {
+        PyBuffer_Release(&view);
+        return NULL;
+    }
+    contents = slice(
+        encoded_data,
+        (const unsigned char *)view.buf,
+        info.contents_start,
+        info.contents_end - (info.indefinite ? 2 : 0)
+    );
+    PyBuffer_Release(&view);
+    if (contents == NULL) {
+        Py_DECREF(header);
+        return NULL;
+    }
+
+    output = Py_BuildValue(
+        "((iinNNO)n)",
+        info.class_,
+        info.method,
+        info.tag,
+        header,
+        contents,
+        trailer,
+        info.contents_end
+    );
+    return output;
+}
+
+
+static PyObject *
+speedups_dump_header(PyObject *self, PyObject *args)
+{
+    PyObject *class_obj;
+    PyObject *method_obj;
+    PyObject *tag_obj;
+    PyObject *contents;
+    Py_ssize_t class_;
+    Py_ssize_t method;
+    Py_ssize_t tag;
+    Py_ssize_t length;
+    unsigned char id_num;
+    unsigned char tag_bytes[16];
+    unsigned char header[32];
+    Py_ssize_t tag_len = 0;
+    Py_ssize_t header_len = 0;
+    Py_ssize_t i;
+
+    if (!PyArg_ParseTuple(args, "OOOO", &class_obj, &method_obj, &tag_obj, &contents)) {
+        return NULL;
+    }
+
+    if (!INT_CHECK(class_obj) || !INT_CHECK(method_obj) || !INT_CHECK(tag_obj)) {
+        return call_fallback(py_dump_header, args, NULL);
+    }
+
+    class_ = PyNumber_AsSsize_t(class_obj, NULL);
+    method = PyNumber_AsSsize_t(method_obj, NULL);
+    tag = PyNumber_AsSsize_t(tag_obj, NULL);
+    if (PyErr_Occurred()) {
+        PyErr_Clear();
+        return call_fallback(py_dump_header, args, NULL);
+    }
+    if (class_ < 0 || class_ > 3 || method < 0 || method > 1 || tag < 0 || tag >= MAX_TAG) {
+        return call_fallback(py_dump_header, args, NULL);
+    }
+
+    if (INT_CHECK(contents)) {
+        length = PyNumber_AsSsize_t(contents, NULL);
+    } else {
+        length = PyObject_Length(contents);
+    }
+    if (length < 0) {
+        PyErr_Clear();
+        return call_fallback(py_dump_header, args, NULL);
+    }
+
+    id_num = (unsigned char)((class_ << 6) | (method << 5));
+
+    if (tag >= 31) {
+        while (tag > 0) {
+            tag_bytes[tag_len] = (unsigned char)((tag_len ? 0x80 : 0) | (tag & 0x7f));
+            tag_len += 1;
+            tag = tag >> 7;
+        }
+        header[header_len++] = id_num | 31;
+        for (i = tag_len - 1; i >= 0; i--) {
+            header[header_len++] = tag_bytes[i];
+        }
+    } else {
+        header[header_len++] = id_num | (unsigned char)tag;
+    }
+
+    if (length <= 127) {
+        header[header_len++] = (unsigned char)length;
+    } else {
+        unsigned char length_bytes[sizeof(Py_ssize_t)];
+        Py_ssize_t length_len = 0;
+        while (length > 0) {
+            length_bytes[length_len++] = (unsigned char)(length & 0xff);
+            length = length >> 8;
+        }
+        header[header_len++] = (unsigned char)(0x80 | length_len);
+        for (i = length_len - 1; i >= 0; i--) {
+            header[header_len++] = length_bytes[i];
+        }
+    }
+
+    return BYTES_FROM_STRING_AND_SIZE((const char *)header, header_len);
+}
+
+
+static PyObject *
+speedups_set_fallbacks(PyObject *self, PyObject *args)
+{
+    PyObject *parse;
+    PyObject *dump_header;
+
+    if (!PyArg_ParseTuple(args, "OO", &parse, &dump_header)) {
+        return NULL;
+    }
+
+    Py_XDECREF(py_parse);
+    Py_XDECREF(py_dump_header);
+    Py_INCREF(parse);
+    Py_INCREF(dump_header);
+    py_parse = parse;
+    py_dump_header = dump_header;
+
+    Py_RETURN_NONE;
+}
+
+
+static PyMethodDef speedups_methods[] = {
+    {"_parse", (PyCFunction)speedups_parse, METH_VARARGS | METH_KEYWORDS,
+     "C implementation of asn1crypto.parser._parse()"},
+    {"_dump_header", (PyCFunction)speedups_dump_header, METH_VARARGS,
+     "C implementation of asn1crypto.parser._dump_header()"},
+    {"_set_fallbacks", (PyCFunction)speedups_set_fallbacks, METH_VARARGS,
+     "Sets the pure-Python functions used for values outside of native integer ranges"},
+    {NULL, NULL, 0, NULL}
+};
+
+
+static int
+init_constants(void)
+{
+    empty_bytes = BYTES_FROM_STRING_AND_SIZE("", 0);
+    eoc_bytes = BYTES_FROM_STRING_AND_SIZE("\x00\x00", 2);
+    return empty_bytes != NULL && eoc_bytes != NULL;
+}
+
+
+#if PY_MAJOR_VERSION >= 3
+
+static struct PyModuleDef speedups_module = {
+    PyModuleDef_HEAD_INIT,
+    "_speedups",
+    "Optional C implementations of asn1crypto.parser internals",
+    -1,
+    speedups_methods
+};
+
+PyMODINIT_FUNC
+PyInit__speedups(void)
+{
+    if (!init_constants()) {
+        return NULL;
+    }
+    return PyModule_Create(&speedups_module);
+}
+
+#else
+
+PyMODINIT_FUNC
+init_speedups(void)
+{
+    if (!init_constants()) {
+        return;
+    }
+    Py_InitModule3("_speedups", speedups_methods, "Optional C implementations of asn1crypto.parser internals");
+}
+
+#endif
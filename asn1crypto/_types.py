@@ -15,6 +15,10 @@ if sys.version_info < (3,):
 
     chr_cls = chr
 
+    # Zero-copy parsing using memoryview objects is only done on Python 3
+    memoryview_cls = None
+    byte_like_types = (str,)
+
 else:
     str_cls = str
     byte_cls = bytes
@@ -25,6 +29,9 @@ else:
     def chr_cls(num):
         return bytes([num])
 
+    memoryview_cls = memoryview
+    byte_like_types = (bytes, memoryview)
+
 
 def type_name(value):
     """
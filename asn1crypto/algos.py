@@ -388,6 +388,53 @@ class SignedDigestAlgorithm(_ForceNullParameters, Sequence):
         'sha3_512_rsa': 'sha3_512',
     }
 
+    _signature_algo_map = {
+        'md2_rsa': 'rsassa_pkcs1v15',
+        'md5_rsa': 'rsassa_pkcs1v15',
+        'sha1_rsa': 'rsassa_pkcs1v15',
+        'sha224_rsa': 'rsassa_pkcs1v15',
+        'sha256_rsa': 'rsassa_pkcs1v15',
+        'sha384_rsa': 'rsassa_pkcs1v15',
+        'sha512_rsa': 'rsassa_pkcs1v15',
+        'sha3_224_rsa': 'rsassa_pkcs1v15',
+        'sha3_256_rsa': 'rsassa_pkcs1v15',
+        'sha3_384_rsa': 'rsassa_pkcs1v15',
+        'sha3_512_rsa': 'rsassa_pkcs1v15',
+        'rsassa_pkcs1v15': 'rsassa_pkcs1v15',
+        'rsassa_pss': 'rsassa_pss',
+        'sha1_dsa': 'dsa',
+        'sha224_dsa': 'dsa',
+        'sha256_dsa': 'dsa',
+        'sha384_dsa': 'dsa',
+        'sha512_dsa': 'dsa',
+        'sha3_224_dsa': 'dsa',
+        'sha3_256_dsa': 'dsa',
+        'sha3_384_dsa': 'dsa',
+        'sha3_512_dsa': 'dsa',
+        'dsa': 'dsa',
+        'sha1_ecdsa': 'ecdsa',
+        'sha224_ecdsa': 'ecdsa',
+        'sha256_ecdsa': 'ecdsa',
+        'sha384_ecdsa': 'ecdsa',
+        'sha512_ecdsa': 'ecdsa',
+        'sha3_224_ecdsa': 'ecdsa',
+        'sha3_256_ecdsa': 'ecdsa',
+        'sha3_384_ecdsa': 'ecdsa',
+        'sha3_512_ecdsa': 'ecdsa',
+        'sha1_ecdsa_plain': 'ecdsa',
+        'sha224_ecdsa_plain': 'ecdsa',
+        'sha256_ecdsa_plain': 'ecdsa',
+        'sha384_ecdsa_plain': 'ecdsa',
+        'sha512_ecdsa_plain': 'ecdsa',
+        'sha3_224_ecdsa_plain': 'ecdsa',
+        'sha3_256_ecdsa_plain': 'ecdsa',
+        'sha3_384_ecdsa_plain': 'ecdsa',
+        'sha3_512_ecdsa_plain': 'ecdsa',
+        'ecdsa': 'ecdsa',
+        'ed25519': 'ed25519',
+        'ed448': 'ed448',
+    }
+
     @property
     def signature_algo(self):
         """
@@ -397,55 +444,8 @@ class SignedDigestAlgorithm(_ForceNullParameters, Sequence):
         """
 
         algorithm = self['algorithm'].native
-
-        algo_map = {
-            'md2_rsa': 'rsassa_pkcs1v15',
-            'md5_rsa': 'rsassa_pkcs1v15',
-            'sha1_rsa': 'rsassa_pkcs1v15',
-            'sha224_rsa': 'rsassa_pkcs1v15',
-            'sha256_rsa': 'rsassa_pkcs1v15',
-            'sha384_rsa': 'rsassa_pkcs1v15',
-            'sha512_rsa': 'rsassa_pkcs1v15',
-            'sha3_224_rsa': 'rsassa_pkcs1v15',
-            'sha3_256_rsa': 'rsassa_pkcs1v15',
-            'sha3_384_rsa': 'rsassa_pkcs1v15',
-            'sha3_512_rsa': 'rsassa_pkcs1v15',
-            'rsassa_pkcs1v15': 'rsassa_pkcs1v15',
-            'rsassa_pss': 'rsassa_pss',
-            'sha1_dsa': 'dsa',
-            'sha224_dsa': 'dsa',
-            'sha256_dsa': 'dsa',
-            'sha384_dsa': 'dsa',
-            'sha512_dsa': 'dsa',
-            'sha3_224_dsa': 'dsa',
-            'sha3_256_dsa': 'dsa',
-            'sha3_384_dsa': 'dsa',
-            'sha3_512_dsa': 'dsa',
-            'dsa': 'dsa',
-            'sha1_ecdsa': 'ecdsa',
-            'sha224_ecdsa': 'ecdsa',
-            'sha256_ecdsa': 'ecdsa',
-            'sha384_ecdsa': 'ecdsa',
-            'sha512_ecdsa': 'ecdsa',
-            'sha3_224_ecdsa': 'ecdsa',
-            'sha3_256_ecdsa': 'ecdsa',
-            'sha3_384_ecdsa': 'ecdsa',
-            'sha3_512_ecdsa': 'ecdsa',
-            'sha1_ecdsa_plain': 'ecdsa',
-            'sha224_ecdsa_plain': 'ecdsa',
-            'sha256_ecdsa_plain': 'ecdsa',
-            'sha384_ecdsa_plain': 'ecdsa',
-            'sha512_ecdsa_plain': 'ecdsa',
-            'sha3_224_ecdsa_plain': 'ecdsa',
-            'sha3_256_ecdsa_plain': 'ecdsa',
-            'sha3_384_ecdsa_plain': 'ecdsa',
-            'sha3_512_ecdsa_plain': 'ecdsa',
-            'ecdsa': 'ecdsa',
-            'ed25519': 'ed25519',
-            'ed448': 'ed448',
-        }
-        if algorithm in algo_map:
-            return algo_map[algorithm]
+        if algorithm in self._signature_algo_map:
+            return self._signature_algo_map[algorithm]
 
         raise ValueError(unwrap(
             '''
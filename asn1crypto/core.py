@@ -51,15 +51,21 @@ from __future__ import unicode_literals, division, absolute_import, print_functi
 from datetime import datetime, timedelta
 from fractions import Fraction
 import binascii
+import bisect
 import copy
 import math
+import mmap as _mmap
 import re
+import shutil
 import sys
+import tempfile
+import types
 
 from . import _teletex_codec
+from ._cache import BoundedCache
 from ._errors import unwrap
 from ._ordereddict import OrderedDict
-from ._types import type_name, str_cls, byte_cls, int_types, chr_cls
+from ._types import type_name, str_cls, byte_cls, byte_like_types, int_types, memoryview_cls
 from .parser import _parse, _dump_header
 from .util import int_to_bytes, int_from_bytes, timezone, extended_datetime, create_timezone, utc_with_dst
 
@@ -103,6 +109,7 @@ METHOD_NUM_TO_NAME_MAP = {
 
 
 _OID_RE = re.compile(r'^\d+(\.\d+)*$')
+_INDEX_RE = re.compile(r'^-?\d+$')
 
 
 # A global tracker to ensure that _setup() is called for every class, even
@@ -111,8 +118,52 @@ _OID_RE = re.compile(r'^\d+(\.\d+)*$')
 # would just see the parent class attributes and would use them.
 _SETUP_CLASSES = {}
 
+# A counter incremented each time a Sequence or SequenceOf is mutated. A value
+# records the count when its children were last found to be unmodified so
+# that _is_mutated() does not walk the tree again until something changes.
+_MUTATION_COUNT = 0
+
+# Named slots reduce the memory used by each value on older interpreters.
+# Since Python 3.11 instance attributes are stored inline in the object, so
+# slots are no smaller, and as of 3.13 a value with both slots and other
+# attributes is larger than one without slots.
+_USE_SLOTS = sys.version_info < (3, 11)
+
+# The default values of the per-instance attributes named in _slot_names by
+# Asn1Value classes. Since slots can not have class-level defaults, when slots
+# are used the defaults are assigned in Asn1Value.__init__(), otherwise they
+# are set as class attributes when the class is set up.
+_SLOT_DEFAULTS = {
+    '_header': None,
+    '_trailer': b'',
+    '_native': None,
+    '_frozen': False,
+    'contents': None,
+    'children': None,
+    '_contents': None,
+    '_mutated': False,
+    '_unmutated_at': -1,
+    '_resume': None,
+    '_frozen_encoding': None,
+    '_choice': None,
+    '_name': None,
+    '_parsed': None,
+    '_unicode': None,
+    '_bytes': None,
+    '_dotted': None,
+    '_child_encodings': None,
+    '_sorted_encodings': None,
+    '_child_contents': None,
+    '_child_markers': None,
+    '_encodings_at': -1,
+}
+
+# A cache of FieldPath objects used by Asn1Value.extract(), keyed by the class
+# and path. Paths may be built from input, so the number cached is bounded.
+_FIELD_PATHS = BoundedCache(256)
 
-def load(encoded_data, strict=False):
+
+def load(encoded_data, strict=False, zero_copy=False):
     """
     Loads a BER/DER-encoded byte string and construct a universal object based
     on the tag value:
@@ -153,6 +204,10 @@ def load(encoded_data, strict=False):
         A boolean indicating if trailing data should be forbidden - if so, a
         ValueError will be raised when trailing data exists
 
+    :param zero_copy:
+        A boolean indicating if constructed values should reference slices of
+        encoded_data instead of copies of it - see Asn1Value.load()
+
     :raises:
         ValueError - when strict is True and trailing data is present
         ValueError - when the encoded value tag a tag other than listed above
@@ -163,7 +218,7 @@ def load(encoded_data, strict=False):
         An instance of the one of the universal classes
     """
 
-    return Asn1Value.load(encoded_data, strict=strict)
+    return Asn1Value.load(encoded_data, strict=strict, zero_copy=zero_copy)
 
 
 def unpickle_helper(asn1crypto_cls, der_bytes):
@@ -180,6 +235,24 @@ class Asn1Value(object):
     The basis of all ASN.1 values
     """
 
+    # The frequently-set instance attributes are named in _slot_names and,
+    # when _USE_SLOTS is True, stored in slots to reduce the memory used by
+    # each value. __dict__ is kept so that subclasses may define other
+    # attributes without needing __slots__.
+    #
+    #  - _header: the BER/DER header bytes
+    #  - _trailer: the BER/DER trailer bytes
+    #  - _native: the native python representation of the value - this is
+    #    not used by some classes since they utilize _bytes or _unicode
+    #  - _frozen: if the value, and all of its children, have been made
+    #    immutable
+    _slot_names = ('_header', '_trailer', '_native', '_frozen')
+    __slots__ = ('__dict__', '__weakref__') + (_slot_names if _USE_SLOTS else ())
+
+    # A tuple of the (name, default) pairs from _SLOT_DEFAULTS that are slots
+    # of the class, which is set when the class is set up
+    _slot_defaults = ()
+
     # The integer 0 for primitive, 1 for constructed
     method = None
 
@@ -200,38 +273,39 @@ class Asn1Value(object):
     # class int and tag int, from innermost to outermost
     explicit = None
 
-    # The BER/DER header bytes
-    _header = None
-
     # Raw encoded value bytes not including class, method, tag, length header
     contents = None
 
-    # The BER/DER trailer bytes
-    _trailer = b''
-
-    # The native python representation of the value - this is not used by
-    # some classes since they utilize _bytes or _unicode
-    _native = None
-
     @classmethod
-    def load(cls, encoded_data, strict=False, **kwargs):
+    def load(cls, encoded_data, strict=False, zero_copy=False, **kwargs):
         """
         Loads a BER/DER-encoded byte string using the current class as the spec
 
         :param encoded_data:
-            A byte string of BER or DER-encoded data
+            A byte string of BER or DER-encoded data. On Python 3 this may also
+            be a memoryview, which implies zero_copy.
 
         :param strict:
             A boolean indicating if trailing data should be forbidden - if so, a
             ValueError will be raised when trailing data exists
 
+        :param zero_copy:
+            A boolean indicating if the data should be parsed through a
+            memoryview so that constructed values (Sequence, SequenceOf, etc)
+            reference slices of encoded_data instead of copies. Byte strings
+            are only created for primitive values, or when .contents or
+            .dump() is called on a constructed value. Ignored on Python 2.
+
         :return:
             An instance of the current class
         """
 
-        if not isinstance(encoded_data, byte_cls):
+        if not isinstance(encoded_data, byte_like_types):
             raise TypeError('encoded_data must be a byte string, not %s' % type_name(encoded_data))
 
+        if zero_copy or encoded_data.__class__ is memoryview_cls:
+            encoded_data = _byte_view(encoded_data)
+
         spec = None
         if cls.tag is not None:
             spec = cls
@@ -239,6 +313,72 @@ class Asn1Value(object):
         value, _ = _parse_build(encoded_data, spec=spec, spec_params=kwargs, strict=strict)
         return value
 
+    @classmethod
+    def extract(cls, encoded_data, path, raw=False):
+        """
+        Extracts a single value from a BER/DER-encoded byte string of the
+        current class, without constructing the values along the path. See
+        FieldPath for details.
+
+        :param encoded_data:
+            A byte string of BER or DER-encoded data
+
+        :param path:
+            A unicode string of field names and SequenceOf indexes separated
+            by ".", e.g. "tbs_certificate.subject", or a list of unicode
+            string field names and integer indexes
+
+        :param raw:
+            If the encoded bytes of the value should be returned instead of an
+            Asn1Value object
+
+        :return:
+            An Asn1Value object, or a byte string if raw is True
+        """
+
+        key = (cls, path if isinstance(path, (str_cls, str)) else tuple(path))
+        field_path = _FIELD_PATHS.get(key)
+        if field_path is None:
+            field_path = FieldPath(cls, path)
+            _FIELD_PATHS.set(key, field_path)
+        return field_path.extract(encoded_data, raw=raw)
+
+    @classmethod
+    def load_file(cls, path, strict=False, mmap=True, **kwargs):
+        """
+        Loads a BER/DER-encoded file using the current class as the spec
+
+        :param path:
+            A unicode string of the filesystem path to the file
+
+        :param strict:
+            A boolean indicating if trailing data should be forbidden - if so, a
+            ValueError will be raised when trailing data exists
+
+        :param mmap:
+            A boolean indicating if the file should be memory-mapped and parsed
+            with zero_copy, so that large files (e.g. CRLs) are not read into
+            memory up front. The mapping is released once the returned value
+            and all of its children are garbage collected. On Python 2, or
+            for empty files, the file is always read.
+
+        :return:
+            An instance of the current class
+        """
+
+        with open(path, 'rb') as f:
+            if mmap and memoryview_cls is not None:
+                try:
+                    mapped = _mmap.mmap(f.fileno(), 0, access=_mmap.ACCESS_READ)
+                except ValueError:
+                    # Empty files can not be mapped
+                    mapped = None
+                if mapped is not None:
+                    return cls.load(memoryview_cls(mapped), strict=strict, **kwargs)
+            encoded_data = f.read()
+
+        return cls.load(encoded_data, strict=strict, **kwargs)
+
     def __init__(self, explicit=None, implicit=None, no_explicit=False, tag_type=None, class_=None, tag=None,
                  optional=None, default=None, contents=None, method=None):
         """
@@ -304,8 +444,24 @@ class Asn1Value(object):
                     cls.explicit = (cls.explicit, )
                 if hasattr(cls, '_setup'):
                     self._setup()
+                if _USE_SLOTS:
+                    # Class attributes, such as Null.contents, take precedence
+                    # over slots defined by a parent class
+                    cls._slot_defaults = tuple(
+                        (name, default)
+                        for name, default in _SLOT_DEFAULTS.items()
+                        if isinstance(getattr(cls, name, None), types.MemberDescriptorType)
+                    )
+                else:
+                    for base in cls.__mro__:
+                        for name in base.__dict__.get('_slot_names', ()):
+                            if name not in base.__dict__:
+                                setattr(base, name, _SLOT_DEFAULTS[name])
                 _SETUP_CLASSES[cls] = True
 
+            for slot_name, slot_value in self._slot_defaults:
+                setattr(self, slot_name, slot_value)
+
             # Normalize tagging values
             if explicit is not None:
                 if isinstance(explicit, int_types):
@@ -607,6 +763,47 @@ class Asn1Value(object):
         self.contents = other.contents
         self._native = copy_func(other._native)
 
+    def freeze(self):
+        """
+        Makes the value, and all of its children, immutable. The native
+        representation and encoding are computed once and cached, so reading
+        them no longer checks the children for changes. Setting or deleting a
+        child of a frozen value raises a TypeError - use .copy() to obtain a
+        mutable copy.
+
+        :return:
+            The Asn1Value object, to allow chaining
+        """
+
+        if not self._frozen:
+            self._freeze()
+            self._frozen = True
+        return self
+
+    def _freeze(self):
+        """
+        Computes the cached values used once the value is frozen
+        """
+
+        self.native
+        self.dump()
+
+    def _assert_mutable(self):
+        """
+        Ensures the value has not been frozen before it is modified
+
+        :raises:
+            TypeError - when the value has been frozen
+        """
+
+        if self._frozen:
+            raise TypeError(unwrap(
+                '''
+                %s has been frozen and can not be modified
+                ''',
+                type_name(self)
+            ))
+
     def debug(self, nest_level=1):
         """
         Show the binary data and parsed data in a tree structure
@@ -654,14 +851,85 @@ class Asn1Value(object):
             header = _dump_header(self.class_, self.method, self.tag, self.contents)
 
             if self.explicit is not None:
+                length = len(self.contents)
                 for class_, tag in self.explicit:
-                    header = _dump_header(class_, 1, tag, header + self.contents) + header
+                    header = _dump_header(class_, 1, tag, len(header) + length) + header
 
             self._header = header
             self._trailer = b''
 
         return self._header + contents + self._trailer
 
+    def dump_iter(self, force=False):
+        """
+        Encodes the value using DER, yielding the encoding in chunks instead of
+        concatenating them. The chunks reference the cached encodings of the
+        value and its children, so unchanged data is not copied. This is
+        suitable for use with socket.sendmsg() or file.writelines().
+
+        :param force:
+            If the encoded contents already exist, clear them and regenerate
+            to ensure they are in DER format instead of BER format
+
+        :return:
+            A generator yielding byte strings and memoryviews
+        """
+
+        if force:
+            self.dump(force=True)
+
+        segments = []
+        _append_segments(self, segments, None)
+        for segment in segments:
+            if len(segment):
+                yield segment
+
+    def dump_into(self, buffer, offset=0, force=False):
+        """
+        Encodes the value using DER, writing the encoding into a buffer
+
+        :param buffer:
+            A bytearray or writable memoryview. A bytearray that is too small
+            will be extended to fit the encoding.
+
+        :param offset:
+            An integer of the offset in buffer to start writing at
+
+        :param force:
+            If the encoded contents already exist, clear them and regenerate
+            to ensure they are in DER format instead of BER format
+
+        :raises:
+            ValueError - when buffer is too small for the encoding
+
+        :return:
+            An integer of the number of bytes written
+        """
+
+        segments = list(self.dump_iter(force=force))
+        length = 0
+        for segment in segments:
+            length += len(segment)
+
+        end = offset + length
+        if len(buffer) < end:
+            if not isinstance(buffer, bytearray):
+                raise ValueError(unwrap(
+                    '''
+                    buffer is too small - %s bytes are required, but only %s
+                    are available
+                    ''',
+                    length,
+                    len(buffer) - offset
+                ))
+            buffer.extend(b'\x00' * (end - len(buffer)))
+
+        for segment in segments:
+            segment_end = offset + len(segment)
+            buffer[offset:segment_end] = segment
+            offset = segment_end
+        return length
+
 
 class ValueMap():
     """
@@ -880,8 +1148,9 @@ class Any(Asn1Value):
     defined.
     """
 
-    # The parsed value object
-    _parsed = None
+    # The encoded contents and the parsed value object
+    _slot_names = ('contents', '_parsed')
+    __slots__ = _slot_names if _USE_SLOTS else ()
 
     def __init__(self, value=None, **kwargs):
         """
@@ -1004,6 +1273,15 @@ class Any(Asn1Value):
         super(Any, self)._copy(other, copy_func)
         self._parsed = copy_func(other._parsed)
 
+    def _freeze(self):
+        """
+        Computes the cached values used once the value is frozen
+        """
+
+        super(Any, self)._freeze()
+        if self._parsed is not None:
+            _freeze_child(self._parsed[0])
+
     def dump(self, force=False):
         """
         Encodes the value using DER
@@ -1027,18 +1305,13 @@ class Choice(Asn1Value):
     A class to handle when a value may be one of several options
     """
 
-    # The index in _alternatives of the validated alternative
-    _choice = None
-
-    # The name of the chosen alternative
-    _name = None
-
-    # The Asn1Value object for the chosen alternative
-    _parsed = None
-
-    # Choice overrides .contents to be a property so that the code expecting
-    # the .contents attribute will get the .contents of the chosen alternative
-    _contents = None
+    # The index in _alternatives of the validated alternative (_choice), the
+    # name of the chosen alternative (_name) and the Asn1Value object for the
+    # chosen alternative (_parsed). Choice overrides .contents to be a
+    # property so that the code expecting the .contents attribute will get the
+    # .contents of the chosen alternative, stored in _contents.
+    _slot_names = ('_choice', '_name', '_parsed', '_contents')
+    __slots__ = _slot_names if _USE_SLOTS else ()
 
     # A list of tuples in one of the following forms.
     #
@@ -1058,24 +1331,32 @@ class Choice(Asn1Value):
     _name_map = None
 
     @classmethod
-    def load(cls, encoded_data, strict=False, **kwargs):
+    def load(cls, encoded_data, strict=False, zero_copy=False, **kwargs):
         """
         Loads a BER/DER-encoded byte string using the current class as the spec
 
         :param encoded_data:
-            A byte string of BER or DER encoded data
+            A byte string of BER or DER encoded data. On Python 3 this may also
+            be a memoryview, which implies zero_copy.
 
         :param strict:
             A boolean indicating if trailing data should be forbidden - if so, a
             ValueError will be raised when trailing data exists
 
+        :param zero_copy:
+            A boolean indicating if the data should be parsed through a
+            memoryview - see Asn1Value.load()
+
         :return:
             A instance of the current class
         """
 
-        if not isinstance(encoded_data, byte_cls):
+        if not isinstance(encoded_data, byte_like_types):
             raise TypeError('encoded_data must be a byte string, not %s' % type_name(encoded_data))
 
+        if zero_copy or encoded_data.__class__ is memoryview_cls:
+            encoded_data = _byte_view(encoded_data)
+
         value, _ = _parse_build(encoded_data, spec=cls, spec_params=kwargs, strict=strict)
         return value
 
@@ -1337,6 +1618,14 @@ class Choice(Asn1Value):
         self._name = other._name
         self._parsed = copy_func(other._parsed)
 
+    def _freeze(self):
+        """
+        Computes the cached values used once the value is frozen
+        """
+
+        _freeze_child(self.chosen)
+        super(Choice, self)._freeze()
+
     def dump(self, force=False):
         """
         Encodes the value using DER
@@ -1656,6 +1945,9 @@ class Primitive(Asn1Value):
     Sets the class_ and method attributes for primitive, universal values
     """
 
+    _slot_names = ('contents',)
+    __slots__ = _slot_names if _USE_SLOTS else ()
+
     class_ = 0
 
     method = 0
@@ -1789,7 +2081,8 @@ class AbstractString(Constructable, Primitive):
     _encoding = 'latin1'
 
     # Instance attribute of (possibly-merged) unicode string
-    _unicode = None
+    _slot_names = ('_unicode',)
+    __slots__ = _slot_names if _USE_SLOTS else ()
 
     def set(self, value):
         """
@@ -2281,6 +2574,8 @@ class BitString(_IntegerBitString, Constructable, Castable, Primitive, ValueMap)
             ValueError - when _map is not set or the key name is invalid
         """
 
+        self._assert_mutable()
+
         is_int = isinstance(key, int_types)
         if not is_int:
             if self._map is None:
@@ -2364,7 +2659,8 @@ class OctetBitString(Constructable, Castable, Primitive):
     tag = 3
 
     # Instance attribute of (possibly-merged) byte string
-    _bytes = None
+    _slot_names = ('_bytes',)
+    __slots__ = _slot_names if _USE_SLOTS else ()
 
     # Tuple of 1s and 0s; set through native
     _unused_bits = ()
@@ -2575,7 +2871,8 @@ class OctetString(Constructable, Castable, Primitive):
     tag = 4
 
     # Instance attribute of (possibly-merged) byte string
-    _bytes = None
+    _slot_names = ('_bytes',)
+    __slots__ = _slot_names if _USE_SLOTS else ()
 
     def set(self, value):
         """
@@ -2730,10 +3027,10 @@ class ParsableOctetString(Constructable, Castable, Primitive):
 
     tag = 4
 
-    _parsed = None
-
-    # Instance attribute of (possibly-merged) byte string
-    _bytes = None
+    # The parsed value, and an instance attribute of (possibly-merged) byte
+    # string
+    _slot_names = ('_parsed', '_bytes')
+    __slots__ = _slot_names if _USE_SLOTS else ()
 
     def __init__(self, value=None, parsed=None, **kwargs):
         """
@@ -2846,6 +3143,15 @@ class ParsableOctetString(Constructable, Castable, Primitive):
         self._bytes = other._bytes
         self._parsed = copy_func(other._parsed)
 
+    def _freeze(self):
+        """
+        Computes the cached values used once the value is frozen
+        """
+
+        super(ParsableOctetString, self)._freeze()
+        if self._parsed is not None:
+            _freeze_child(self._parsed[0])
+
     @property
     def native(self):
         """
@@ -2996,7 +3302,122 @@ class ObjectIdentifier(Primitive, ValueMap):
     tag = 6
 
     # A unicode string of the dotted form of the object identifier
-    _dotted = None
+    _slot_names = ('_dotted',)
+    __slots__ = _slot_names if _USE_SLOTS else ()
+
+    # A _cache.BoundedCache of encoded contents to dotted unicode strings,
+    # shared by all ObjectIdentifier classes, or None when the cache is
+    # disabled - see enable_cache()
+    _cache = None
+
+    # A _cache.BoundedCache of dotted unicode strings to encoded contents,
+    # used by set(), or None when the cache is disabled
+    _encode_cache = None
+
+    @classmethod
+    def enable_cache(cls, max_size=4096, seed=True):
+        """
+        Enables a cache of the dotted form of decoded object identifiers,
+        keyed by their encoded contents, along with a cache of the encoded
+        form of dotted strings passed to set(). Both are shared by all
+        ObjectIdentifier classes. When the same OIDs are decoded repeatedly,
+        such as when processing many certificates, each one is only
+        converted to a unicode string once, and all instances share the
+        string.
+
+        :param max_size:
+            An integer of the maximum number of OIDs to cache in each
+            direction - once full, the least recently used entry is removed
+            for each new OID
+
+        :param seed:
+            If the caches should be filled with the OIDs from the _map of
+            every ObjectIdentifier class that has been imported, such as
+            those in asn1crypto.x509 and asn1crypto.algos
+
+        :raises:
+            ValueError - when max_size is less than 1
+        """
+
+        ObjectIdentifier._cache = BoundedCache(max_size)
+        ObjectIdentifier._encode_cache = BoundedCache(max_size)
+
+        if seed:
+            classes = [ObjectIdentifier]
+            while classes:
+                oid_cls = classes.pop()
+                classes.extend(oid_cls.__subclasses__())
+                if not oid_cls.__dict__.get('_map'):
+                    continue
+                for dotted in oid_cls._map:
+                    try:
+                        contents = _encode_oid(dotted)
+                    except (ValueError):
+                        continue
+                    ObjectIdentifier._cache.set(contents, dotted)
+                    ObjectIdentifier._encode_cache.set(dotted, contents)
+
+    @classmethod
+    def disable_cache(cls):
+        """
+        Disables and clears the caches enabled by enable_cache()
+        """
+
+        ObjectIdentifier._cache = None
+        ObjectIdentifier._encode_cache = None
+
+    @classmethod
+    def cache_info(cls):
+        """
+        :return:
+            None if the cache is disabled, otherwise a dict with the integer
+            keys "hits", "misses", "size" and "max_size". The hits, misses
+            and size are totals for both decoding and encoding, while the
+            max_size applies to each direction.
+        """
+
+        if ObjectIdentifier._cache is None:
+            return None
+        info = ObjectIdentifier._cache.info()
+        encode_info = ObjectIdentifier._encode_cache.info()
+        for key in ('hits', 'misses', 'size'):
+            info[key] += encode_info[key]
+        return info
+
+    @classmethod
+    def decode_many(cls, encoded_values):
+        """
+        Decodes a batch of object identifiers. Each distinct encoding is only
+        decoded once, and the cache from enable_cache() is used when enabled.
+
+        :param encoded_values:
+            An iterable of byte strings of the encoded contents of object
+            identifiers, i.e. without the tag and length header
+
+        :return:
+            A list of unicode strings, in the same order - mapped via _map
+            when the class defines one, otherwise in dotted form
+        """
+
+        cache = ObjectIdentifier._cache
+        mapping = cls._map or {}
+        decoded = {}
+        output = []
+        for contents in encoded_values:
+            if contents.__class__ is memoryview_cls:
+                contents = contents.tobytes()
+            value = decoded.get(contents)
+            if value is None:
+                dotted = None
+                if cache is not None:
+                    dotted = cache.get(contents)
+                if dotted is None:
+                    dotted = _decode_oid(contents)
+                    if cache is not None:
+                        cache.set(contents, dotted)
+                value = decoded[contents] = mapping.get(dotted, dotted)
+            output.append(value)
+        return output
 
     @classmethod
     def map(cls, value):
@@ -3109,39 +3530,15 @@ class ObjectIdentifier(Primitive, ValueMap):
             if value in self._reverse_map:
                 value = self._reverse_map[value]
 
-        self.contents = b''
-        first = None
-        for index, part in enumerate(value.split('.')):
-            part = int(part)
-
-            # The first two parts are merged into a single byte
-            if index == 0:
-                first = part
-                continue
-            elif index == 1:
-                if first > 2:
-                    raise ValueError(unwrap(
-                        '''
-                        First arc must be one of 0, 1 or 2, not %s
-                        ''',
-                        repr(first)
-                    ))
-                elif first < 2 and part >= 40:
-                    raise ValueError(unwrap(
-                        '''
-                        Second arc must be less than 40 if first arc is 0 or
-                        1, not %s
-                        ''',
-                        repr(part)
-                    ))
-                part = (first * 40) + part
-
-            encoded_part = chr_cls(0x7F & part)
-            part = part >> 7
-            while part > 0:
-                encoded_part = chr_cls(0x80 | (0x7F & part)) + encoded_part
-                part = part >> 7
-            self.contents += encoded_part
+        cache = ObjectIdentifier._encode_cache
+        contents = None
+        if cache is not None:
+            contents = cache.get(value)
+        if contents is None:
+            contents = _encode_oid(value)
+            if cache is not None:
+                cache.set(value, contents)
+        self.contents = contents
 
         self._header = None
         if self._trailer != b'':
@@ -3164,31 +3561,19 @@ class ObjectIdentifier(Primitive, ValueMap):
         """
 
         if self._dotted is None:
-            output = []
-
-            part = 0
-            for byte in self.contents:
-                if _PY2:
-                    byte = ord(byte)
-                part = part * 128
-                part += byte & 127
-                # Last byte in subidentifier has the eighth bit set to 0
-                if byte & 0x80 == 0:
-                    if len(output) == 0:
-                        if part >= 80:
-                            output.append(str_cls(2))
-                            output.append(str_cls(part - 80))
-                        elif part >= 40:
-                            output.append(str_cls(1))
-                            output.append(str_cls(part - 40))
-                        else:
-                            output.append(str_cls(0))
-                            output.append(str_cls(part))
-                    else:
-                        output.append(str_cls(part))
-                    part = 0
-
-            self._dotted = '.'.join(output)
+            cache = ObjectIdentifier._cache
+            if cache is not None:
+                key = self.contents
+                # Caching a view would keep the whole source buffer alive
+                if key.__class__ is memoryview_cls:
+                    key = key.tobytes()
+                self._dotted = cache.get(key)
+                if self._dotted is not None:
+                    return self._dotted
+
+            self._dotted = _decode_oid(self.contents)
+            if cache is not None:
+                cache.set(key, self._dotted)
         return self._dotted
 
     @property
@@ -3328,21 +3713,26 @@ class Sequence(Asn1Value):
     dict-like interface
     """
 
+    # A list of child objects, in order of _fields (children). Sequence
+    # overrides .contents to be a property so that the mutated state of child
+    # objects can be checked to ensure everything is up-to-date, which is
+    # stored in _contents, along with if the object has been mutated
+    # (_mutated) and the _MUTATION_COUNT when the children were last found to
+    # be unmodified (_unmutated_at). When __getitem__() has only parsed the
+    # children up to the requested field, _resume is a 3-element tuple of the
+    # partial list of children, the parsed parts of the next child (or None)
+    # and the offset into the contents to continue parsing from, and children
+    # remains None until parsing completes. The encoded value is cached in
+    # _frozen_encoding once freeze() has been called on the value, but not on
+    # the descendants it freezes.
+    _slot_names = ('children', '_contents', '_mutated', '_unmutated_at', '_resume', '_frozen_encoding')
+    __slots__ = _slot_names if _USE_SLOTS else ()
+
     tag = 16
 
     class_ = 0
     method = 1
 
-    # A list of child objects, in order of _fields
-    children = None
-
-    # Sequence overrides .contents to be a property so that the mutated state
-    # of child objects can be checked to ensure everything is up-to-date
-    _contents = None
-
-    # Variable to track if the object has been mutated
-    _mutated = False
-
     # A list of tuples in one of the following forms.
     #
     # Option 1, a unicode string field name and a value class
@@ -3379,6 +3769,14 @@ class Sequence(Asn1Value):
     # Predetermined field specs to optimize away calls to _determine_spec()
     _precomputed_specs = None
 
+    # A list in the same order as _fields used to decide if an optional or
+    # default field is present when parsing - see _build_field_matcher()
+    _field_matchers = None
+
+    # A dict of integer indexes in _fields of default fields to the byte
+    # string encoding of the default value - see _default_encoding()
+    _default_encodings = None
+
     def __init__(self, value=None, default=None, **kwargs):
         """
         Allows setting field values before passing everything else along to
@@ -3462,12 +3860,14 @@ class Sequence(Asn1Value):
             A byte string of the DER-encoded contents of the sequence
         """
 
-        if self.children is None:
-            return self._contents
-
-        if self._is_mutated():
+        if (self.children is not None or self._resume is not None) and self._is_mutated():
             self._set_contents()
 
+        # Values loaded with zero_copy hold a memoryview until the bytes
+        # are actually requested
+        elif self._contents.__class__ is memoryview_cls:
+            self._contents = self._contents.tobytes()
+
         return self._contents
 
     @contents.setter
@@ -3486,13 +3886,31 @@ class Sequence(Asn1Value):
             mutated
         """
 
-        mutated = self._mutated
-        if self.children is not None:
-            for child in self.children:
+        if self._frozen:
+            return False
+
+        # The count is read before the walk, so that a mutation made while
+        # walking is not recorded as having been checked
+        mutation_count = _MUTATION_COUNT
+
+        if self._mutated:
+            return True
+
+        if self._unmutated_at == mutation_count:
+            return False
+
+        children = self.children
+        if children is None and self._resume is not None:
+            children = self._resume[0]
+
+        if children is not None:
+            for child in children:
                 if isinstance(child, Sequence) or isinstance(child, SequenceOf):
-                    mutated = mutated or child._is_mutated()
+                    if child._is_mutated():
+                        return True
 
-        return mutated
+        self._unmutated_at = mutation_count
+        return False
 
     def _lazy_child(self, index):
         """
@@ -3529,10 +3947,6 @@ class Sequence(Asn1Value):
             The Asn1Value object of the field specified
         """
 
-        # We inline this check to prevent method invocation each time
-        if self.children is None:
-            self._parse_children()
-
         if not isinstance(key, int_types):
             if key not in self._field_map:
                 raise KeyError(unwrap(
@@ -3544,7 +3958,16 @@ class Sequence(Asn1Value):
                 ))
             key = self._field_map[key]
 
-        if key >= len(self.children):
+        # Only the children up to the requested field are parsed, so the
+        # cost of accessing early fields doesn't depend on the later ones
+        children = self.children
+        if children is None:
+            self._parse_children(until=key if key >= 0 else None)
+            children = self.children
+            if children is None:
+                children = self._resume[0]
+
+        if key >= len(children):
             raise KeyError(unwrap(
                 '''
                 No field numbered %s is present in this %s
@@ -3554,7 +3977,10 @@ class Sequence(Asn1Value):
             ))
 
         try:
-            return self._lazy_child(key)
+            child = children[key]
+            if child.__class__ == tuple:
+                child = children[key] = _build(*child)
+            return child
 
         except (ValueError, TypeError) as e:
             args = e.args[1:]
@@ -3576,6 +4002,8 @@ class Sequence(Asn1Value):
             ValueError - when a field name or index is invalid
         """
 
+        self._assert_mutable()
+
         # We inline this check to prevent method invocation each time
         if self.children is None:
             self._parse_children()
@@ -3615,6 +4043,7 @@ class Sequence(Asn1Value):
         if self._native is not None:
             self._native[self._fields[key][0]] = self.children[key].native
         self._mutated = True
+        _note_mutation()
 
     def __delitem__(self, key):
         """
@@ -3627,6 +4056,8 @@ class Sequence(Asn1Value):
             ValueError - when a field name or index is invalid, or the field is not optional or defaulted
         """
 
+        self._assert_mutable()
+
         # We inline this check to prevent method invocation each time
         if self.children is None:
             self._parse_children()
@@ -3660,6 +4091,7 @@ class Sequence(Asn1Value):
         else:
             self.__setitem__(key, None)
         self._mutated = True
+        _note_mutation()
 
     def __iter__(self):
         """
@@ -3683,22 +4115,22 @@ class Sequence(Asn1Value):
         if self.children is None:
             self._parse_children()
 
+        if not force:
+            _splice_contents(self)
+            return
+
         contents = BytesIO()
         for index, info in enumerate(self._fields):
             child = self.children[index]
             if child is None:
                 child_dump = b''
             elif child.__class__ == tuple:
-                if force:
-                    child_dump = self._lazy_child(index).dump(force=force)
-                else:
-                    child_dump = child[3] + child[4] + child[5]
+                child_dump = self._lazy_child(index).dump(force=force)
             else:
                 child_dump = child.dump(force=force)
             # Skip values that are the same as the default
             if info[2] and 'default' in info[2]:
-                default_value = info[1](**info[2])
-                if default_value.dump() == child_dump:
+                if self._default_encoding(index) == child_dump:
                     continue
             contents.write(child_dump)
         self._contents = contents.getvalue()
@@ -3708,6 +4140,63 @@ class Sequence(Asn1Value):
         if self._trailer != b'':
             self._trailer = b''
 
+    def _content_segments(self, segments, spans):
+        """
+        Appends the encodings of the children to a list of byte strings that
+        are joined to form the contents, re-encoding only mutated children
+
+        :param segments:
+            A list to append byte strings and memoryviews to
+
+        :param spans:
+            A list to append 4-element tuples to for each mutated child, or
+            None - see _append_segments()
+
+        :raises:
+            ValueError - when a required field is missing
+
+        :return:
+            An integer of the number of bytes appended to segments
+        """
+
+        self._check_required_fields()
+
+        length = 0
+        for index, info in enumerate(self._fields):
+            child = self.children[index]
+            if child is None:
+                continue
+            # Skip values that are the same as the default
+            if info[2] and 'default' in info[2]:
+                if child.__class__ == tuple:
+                    child_dump = b''.join(child[3:6])
+                else:
+                    child_dump = child.dump()
+                if self._default_encoding(index) == child_dump:
+                    continue
+                segments.append(child_dump)
+                length += len(child_dump)
+            else:
+                length += _append_segments(child, segments, spans)
+        return length
+
+    def _default_encoding(self, index):
+        """
+        Encodes the default value of a field
+
+        :param index:
+            The integer index of the field in _fields
+
+        :return:
+            A byte string of the encoded default value
+        """
+
+        cls = self.__class__
+        if index not in cls._default_encodings:
+            _, spec, params = cls._fields[index]
+            cls._default_encodings[index] = spec(**params).dump()
+        return cls._default_encodings[index]
+
     def _setup(self):
         """
         Generates _field_map, _field_ids and _oid_nums for use in parsing
@@ -3716,7 +4205,9 @@ class Sequence(Asn1Value):
         cls = self.__class__
         cls._field_map = {}
         cls._field_ids = []
+        cls._default_encodings = {}
         cls._precomputed_specs = []
+        cls._field_matchers = []
         for index, field in enumerate(cls._fields):
             if len(field) < 3:
                 field = field + ({},)
@@ -3732,8 +4223,11 @@ class Sequence(Asn1Value):
             is_mapped_oid = cls._oid_nums is not None and cls._oid_nums[1] == index
             if has_callback or is_mapped_oid:
                 cls._precomputed_specs.append(None)
+                spec = None
             else:
                 cls._precomputed_specs.append((field[0], field[1], field[1], field[2], None))
+                spec = field[1]
+            cls._field_matchers.append(_build_field_matcher(spec, field[2], cls._field_ids[index]))
 
     def _determine_spec(self, index):
         """
@@ -3878,7 +4372,7 @@ class Sequence(Asn1Value):
 
         return new_value
 
-    def _parse_children(self, recurse=False):
+    def _parse_children(self, recurse=False, until=None):
         """
         Parses the contents and generates Asn1Value objects based on the
         definitions from _fields.
@@ -3887,6 +4381,12 @@ class Sequence(Asn1Value):
             If child objects that are Sequence or SequenceOf objects should
             be recursively parsed
 
+        :param until:
+            None to parse all of the children, or an integer field index to
+            stop parsing once that field has been reached. If parsing stops
+            early, the partial list of children is stored in _resume and the
+            next call continues from that point.
+
         :raises:
             ValueError - when an error occurs parsing child objects
         """
@@ -3905,14 +4405,25 @@ class Sequence(Asn1Value):
             return
 
         try:
-            self.children = []
+            if self._resume is None:
+                children = []
+                parts = None
+                child_pointer = 0
+            else:
+                children, parts, child_pointer = self._resume
+                self._resume = None
+            # Spec callbacks and OID specs may use the preceding children
+            self.children = children
             contents_length = len(self._contents)
-            child_pointer = 0
-            field = 0
+            field = len(children)
             field_len = len(self._fields)
-            parts = None
-            again = child_pointer < contents_length
+            again = parts is not None or child_pointer < contents_length
             while again:
+                if until is not None and field > until:
+                    self.children = None
+                    self._resume = (children, parts, child_pointer)
+                    return
+
                 if parts is None:
                     parts, child_pointer = _parse(self._contents, contents_length, pointer=child_pointer)
                 again = child_pointer < contents_length
@@ -3922,28 +4433,21 @@ class Sequence(Asn1Value):
                         cls._precomputed_specs[field] or self._determine_spec(field))
 
                     # If the next value is optional or default, allow it to be absent
-                    if field_params and ('optional' in field_params or 'default' in field_params):
-                        if self._field_ids[field] != (parts[0], parts[2]) and field_spec != Any:
-
-                            # See if the value is a valid choice before assuming
-                            # that we have a missing optional or default value
-                            choice_match = False
-                            if issubclass(field_spec, Choice):
-                                try:
-                                    tester = field_spec(**field_params)
-                                    tester.validate(parts[0], parts[2], parts[4])
-                                    choice_match = True
-                                except (ValueError):
-                                    pass
-
-                            if not choice_match:
-                                if 'optional' in field_params:
-                                    self.children.append(VOID)
-                                else:
-                                    self.children.append(field_spec(**field_params))
-                                field += 1
-                                again = True
-                                continue
+                    matcher = cls._field_matchers[field]
+                    if matcher is not None:
+                        if matcher is False:
+                            present = _field_matches(self._field_ids[field], field_spec, field_params, parts)
+                        else:
+                            present = (parts[0], parts[2]) in matcher
+
+                        if not present:
+                            if 'optional' in field_params:
+                                self.children.append(VOID)
+                            else:
+                                self.children.append(field_spec(**field_params))
+                            field += 1
+                            again = True
+                            continue
 
                     if field_spec is None or (spec_override and issubclass(field_spec, Any)):
                         field_spec = value_spec
@@ -4063,7 +4567,14 @@ class Sequence(Asn1Value):
             recursively converted to native representation also.
         """
 
-        if self.contents is None:
+        if self._frozen:
+            return self._native
+
+        # Mutated values are re-encoded as .contents would, but otherwise
+        # .contents is avoided so zero-copy values are not turned into bytes
+        if self._is_mutated():
+            self._set_contents()
+        elif self._contents is None:
             return None
 
         if self._native is None:
@@ -4108,6 +4619,41 @@ class Sequence(Asn1Value):
                 else:
                     self.children.append(child.copy())
 
+    def freeze(self):
+        """
+        Makes the value, and all of its children, immutable. The native
+        representation and encoding are computed once and cached, so reading
+        them no longer checks the children for changes. Setting or deleting a
+        child of a frozen value raises a TypeError - use .copy() to obtain a
+        mutable copy.
+
+        :return:
+            The Asn1Value object, to allow chaining
+        """
+
+        if not self._frozen:
+            Asn1Value.freeze(self)
+            # Only the value freeze() was called on caches its encoding, since
+            # the encoding of each descendant is already held in its header
+            # and contents
+            self._frozen_encoding = Asn1Value.dump(self)
+        return self
+
+    def _freeze(self):
+        """
+        Freezes all of the child objects, and then computes the cached values
+        used once the value is frozen
+        """
+
+        # Frozen children are no longer reported as mutated, so any mutations
+        # must be encoded before they are frozen
+        self.contents
+        if self.children is None:
+            self._parse_children()
+        for index in range(len(self.children)):
+            _freeze_child(self._lazy_child(index))
+        self.native
+
     def debug(self, nest_level=1):
         """
         Show the binary data and parsed data in a tree structure
@@ -4136,6 +4682,9 @@ class Sequence(Asn1Value):
             A byte string of the DER-encoded value
         """
 
+        if self._frozen_encoding is not None and not force:
+            return self._frozen_encoding
+
         # If the length is indefinite, force the re-encoding
         if self._header is not None and self._header[-1:] == b'\x80':
             force = True
@@ -4147,6 +4696,21 @@ class Sequence(Asn1Value):
         if force:
             self._set_contents(force=force)
 
+        self._check_required_fields()
+
+        encoded = Asn1Value.dump(self)
+        if self._frozen_encoding is not None:
+            self._frozen_encoding = encoded
+        return encoded
+
+    def _check_required_fields(self):
+        """
+        Ensures that all fields that are not optional or defaulted have a value
+
+        :raises:
+            ValueError - when a required field is missing
+        """
+
         if self._fields and self.children is not None:
             for index, (field_name, _, params) in enumerate(self._fields):
                 if self.children[index] is not VOID:
@@ -4160,8 +4724,6 @@ class Sequence(Asn1Value):
                     field_name
                 ))
 
-        return Asn1Value.dump(self)
-
 
 class SequenceOf(Asn1Value):
     """
@@ -4169,21 +4731,21 @@ class SequenceOf(Asn1Value):
     Python object with a list-like interface
     """
 
+    # A list of child objects (children). SequenceOf overrides .contents to
+    # be a property so that the mutated state of child objects can be checked
+    # to ensure everything is up-to-date, which is stored in _contents, along
+    # with if the object has been mutated (_mutated) and the _MUTATION_COUNT
+    # when the children were last found to be unmodified (_unmutated_at). The
+    # encoded value is cached in _frozen_encoding once freeze() has been
+    # called on the value, but not on the descendants it freezes.
+    _slot_names = ('children', '_contents', '_mutated', '_unmutated_at', '_frozen_encoding')
+    __slots__ = _slot_names if _USE_SLOTS else ()
+
     tag = 16
 
     class_ = 0
     method = 1
 
-    # A list of child objects
-    children = None
-
-    # SequenceOf overrides .contents to be a property so that the mutated state
-    # of child objects can be checked to ensure everything is up-to-date
-    _contents = None
-
-    # Variable to track if the object has been mutated
-    _mutated = False
-
     # An Asn1Value class to use when parsing children
     _child_spec = None
 
@@ -4237,12 +4799,14 @@ class SequenceOf(Asn1Value):
             A byte string of the DER-encoded contents of the sequence
         """
 
-        if self.children is None:
-            return self._contents
-
-        if self._is_mutated():
+        if self.children is not None and self._is_mutated():
             self._set_contents()
 
+        # Values loaded with zero_copy hold a memoryview until the bytes
+        # are actually requested
+        elif self._contents.__class__ is memoryview_cls:
+            self._contents = self._contents.tobytes()
+
         return self._contents
 
     @contents.setter
@@ -4261,13 +4825,27 @@ class SequenceOf(Asn1Value):
             mutated
         """
 
-        mutated = self._mutated
+        if self._frozen:
+            return False
+
+        # The count is read before the walk, so that a mutation made while
+        # walking is not recorded as having been checked
+        mutation_count = _MUTATION_COUNT
+
+        if self._mutated:
+            return True
+
+        if self._unmutated_at == mutation_count:
+            return False
+
         if self.children is not None:
             for child in self.children:
                 if isinstance(child, Sequence) or isinstance(child, SequenceOf):
-                    mutated = mutated or child._is_mutated()
+                    if child._is_mutated():
+                        return True
 
-        return mutated
+        self._unmutated_at = mutation_count
+        return False
 
     def _lazy_child(self, index):
         """
@@ -4372,6 +4950,8 @@ class SequenceOf(Asn1Value):
             new child object
         """
 
+        self._assert_mutable()
+
         # We inline this checks to prevent method invocation each time
         if self.children is None:
             self._parse_children()
@@ -4390,6 +4970,7 @@ class SequenceOf(Asn1Value):
             self._native[key] = self.children[key].native
 
         self._mutated = True
+        _note_mutation()
 
     def __delitem__(self, key):
         """
@@ -4399,6 +4980,8 @@ class SequenceOf(Asn1Value):
             Integer index of child
         """
 
+        self._assert_mutable()
+
         # We inline this checks to prevent method invocation each time
         if self.children is None:
             self._parse_children()
@@ -4408,6 +4991,7 @@ class SequenceOf(Asn1Value):
             self._native.pop(key)
 
         self._mutated = True
+        _note_mutation()
 
     def __iter__(self):
         """
@@ -4460,6 +5044,8 @@ class SequenceOf(Asn1Value):
             new child object
         """
 
+        self._assert_mutable()
+
         # We inline this checks to prevent method invocation each time
         if self.children is None:
             self._parse_children()
@@ -4470,6 +5056,7 @@ class SequenceOf(Asn1Value):
             self._native.append(self.children[-1].native)
 
         self._mutated = True
+        _note_mutation()
 
     def _set_contents(self, force=False):
         """
@@ -4483,6 +5070,10 @@ class SequenceOf(Asn1Value):
         if self.children is None:
             self._parse_children()
 
+        if not force:
+            _splice_contents(self)
+            return
+
         contents = BytesIO()
         for child in self:
             contents.write(child.dump(force=force))
@@ -4492,6 +5083,30 @@ class SequenceOf(Asn1Value):
         if self._trailer != b'':
             self._trailer = b''
 
+    def _content_segments(self, segments, spans):
+        """
+        Appends the encodings of the children to a list of byte strings that
+        are joined to form the contents, re-encoding only mutated children
+
+        :param segments:
+            A list to append byte strings and memoryviews to
+
+        :param spans:
+            A list to append 4-element tuples to for each mutated child, or
+            None - see _append_segments()
+
+        :return:
+            An integer of the number of bytes appended to segments
+        """
+
+        length = 0
+        for index, child in enumerate(self.children):
+            # Indefinite-length children are re-encoded as DER
+            if child.__class__ == tuple and child[3][-1:] == b'\x80':
+                child = self._lazy_child(index)
+            length += _append_segments(child, segments, spans)
+        return length
+
     def _parse_children(self, recurse=False):
         """
         Parses the contents and generates Asn1Value objects based on the
@@ -4528,6 +5143,45 @@ class SequenceOf(Asn1Value):
             e.args = (e.args[0] + '\n    while parsing %s' % type_name(self),) + args
             raise e
 
+    def iter_children(self):
+        """
+        Iterates over the child objects without storing them on this object.
+        Unlike iter(), memory use stays constant regardless of the number of
+        children, however the yielded objects are not attached to this object,
+        so changes to them will not be reflected in the encoding of this
+        object.
+
+        :raises:
+            ValueError - when an error occurs parsing child objects
+
+        :return:
+            A generator of child objects
+        """
+
+        if self.children is not None:
+            for index in range(0, len(self.children)):
+                yield self._lazy_child(index)
+            return
+
+        contents = self._contents
+        if contents is None:
+            return
+
+        contents_length = len(contents)
+        child_pointer = 0
+        while child_pointer < contents_length:
+            try:
+                parts, child_pointer = _parse(contents, contents_length, pointer=child_pointer)
+                if self._child_spec:
+                    child = _build(*parts, spec=self._child_spec)
+                else:
+                    child = _build(*parts)
+            except (ValueError, TypeError) as e:
+                args = e.args[1:]
+                e.args = (e.args[0] + '\n    while parsing %s' % type_name(self),) + args
+                raise e
+            yield child
+
     def spec(self):
         """
         Determines the spec to use for child values.
@@ -4549,7 +5203,14 @@ class SequenceOf(Asn1Value):
             converted to native representation also.
         """
 
-        if self.contents is None:
+        if self._frozen:
+            return self._native
+
+        # Mutated values are re-encoded as .contents would, but otherwise
+        # .contents is avoided so zero-copy values are not turned into bytes
+        if self._is_mutated():
+            self._set_contents()
+        elif self._contents is None:
             return None
 
         if self._native is None:
@@ -4584,6 +5245,41 @@ class SequenceOf(Asn1Value):
                 else:
                     self.children.append(child.copy())
 
+    def freeze(self):
+        """
+        Makes the value, and all of its children, immutable. The native
+        representation and encoding are computed once and cached, so reading
+        them no longer checks the children for changes. Setting or deleting a
+        child of a frozen value raises a TypeError - use .copy() to obtain a
+        mutable copy.
+
+        :return:
+            The Asn1Value object, to allow chaining
+        """
+
+        if not self._frozen:
+            Asn1Value.freeze(self)
+            # Only the value freeze() was called on caches its encoding, since
+            # the encoding of each descendant is already held in its header
+            # and contents
+            self._frozen_encoding = Asn1Value.dump(self)
+        return self
+
+    def _freeze(self):
+        """
+        Freezes all of the child objects, and then computes the cached values
+        used once the value is frozen
+        """
+
+        # Frozen children are no longer reported as mutated, so any mutations
+        # must be encoded before they are frozen
+        self.contents
+        if self.children is None:
+            self._parse_children()
+        for index in range(len(self.children)):
+            _freeze_child(self._lazy_child(index))
+        self.native
+
     def debug(self, nest_level=1):
         """
         Show the binary data and parsed data in a tree structure
@@ -4609,6 +5305,9 @@ class SequenceOf(Asn1Value):
             A byte string of the DER-encoded value
         """
 
+        if self._frozen_encoding is not None and not force:
+            return self._frozen_encoding
+
         # If the length is indefinite, force the re-encoding
         if self._header is not None and self._header[-1:] == b'\x80':
             force = True
@@ -4616,7 +5315,10 @@ class SequenceOf(Asn1Value):
         if force:
             self._set_contents(force=force)
 
-        return Asn1Value.dump(self)
+        encoded = Asn1Value.dump(self)
+        if self._frozen_encoding is not None:
+            self._frozen_encoding = encoded
+        return encoded
 
 
 class Set(Sequence):
@@ -4630,7 +5332,8 @@ class Set(Sequence):
     tag = 17
 
     # A dict of 2-element tuples in the form (class_, tag) as keys and integers
-    # as values that are the index of the field in _fields
+    # as values that are the index of the field in _fields. The alternatives
+    # of untagged Choice fields are included.
     _field_ids = None
 
     def _setup(self):
@@ -4641,13 +5344,25 @@ class Set(Sequence):
         cls = self.__class__
         cls._field_map = {}
         cls._field_ids = {}
+        cls._default_encodings = {}
         cls._precomputed_specs = []
+        choice_fields = []
         for index, field in enumerate(cls._fields):
             if len(field) < 3:
                 field = field + ({},)
                 cls._fields[index] = field
             cls._field_map[field[0]] = index
             cls._field_ids[_build_id_tuple(field[2], field[1])] = index
+            if field[1] is not None and issubclass(field[1], Choice):
+                choice_fields.append(index)
+
+        # The alternatives of a Choice are added after all of the other fields
+        # so they never take precedence over a field with the same tag
+        for index in choice_fields:
+            _, field_spec, field_params = cls._fields[index]
+            for id_ in _choice_ids(field_spec, field_params) or ():
+                if id_ not in cls._field_ids:
+                    cls._field_ids[id_] = index
 
         if cls._oid_pair is not None:
             cls._oid_nums = (cls._field_map[cls._oid_pair[0]], cls._field_map[cls._oid_pair[1]])
@@ -4660,7 +5375,7 @@ class Set(Sequence):
             else:
                 cls._precomputed_specs.append((field[0], field[1], field[1], field[2], None))
 
-    def _parse_children(self, recurse=False):
+    def _parse_children(self, recurse=False, until=None):
         """
         Parses the contents and generates Asn1Value objects based on the
         definitions from _fields.
@@ -4669,6 +5384,10 @@ class Set(Sequence):
             If child objects that are Sequence or SequenceOf objects should
             be recursively parsed
 
+        :param until:
+            Ignored, since the fields of a set may be encoded in any order all
+            of the children are always parsed
+
         :raises:
             ValueError - when an error occurs parsing child objects
         """
@@ -4688,11 +5407,11 @@ class Set(Sequence):
 
         try:
             child_map = {}
-            contents_length = len(self.contents)
+            contents_length = len(self._contents)
             child_pointer = 0
             seen_field = 0
             while child_pointer < contents_length:
-                parts, child_pointer = _parse(self.contents, contents_length, pointer=child_pointer)
+                parts, child_pointer = _parse(self._contents, contents_length, pointer=child_pointer)
 
                 id_ = (parts[0], parts[2])
 
@@ -4788,15 +5507,27 @@ class Set(Sequence):
 
         child_tag_encodings = []
         for index, child in enumerate(self.children):
+            # Absent optional children have no encoding, nor a tag to sort by
+            if isinstance(child, Void):
+                continue
+
             child_encoding = child.dump(force=force)
 
             # Skip encoding defaulted children
             name, spec, field_params = self._fields[index]
             if 'default' in field_params:
-                if spec(**field_params).dump() == child_encoding:
+                if self._default_encoding(index) == child_encoding:
                     continue
 
-            child_tag_encodings.append((child.tag, child_encoding))
+            # DER orders the children by the class and then tag of the outer
+            # header. An untagged Choice is encoded using the chosen alternative.
+            tagged = child
+            if isinstance(tagged, Choice) and tagged.explicit is None:
+                tagged = tagged.chosen
+            if tagged.explicit is not None:
+                child_tag_encodings.append((tagged.explicit[-1], child_encoding))
+            else:
+                child_tag_encodings.append(((tagged.class_, tagged.tag), child_encoding))
         child_tag_encodings.sort(key=lambda ct: ct[0])
 
         self._contents = b''.join([ct[1] for ct in child_tag_encodings])
@@ -4812,14 +5543,76 @@ class SetOf(SequenceOf):
     Python object with a list-like interface
     """
 
+    # A list of the encoding of each child, by index, along with a sorted
+    # list of the same encodings (_sorted_encodings), used so that re-encoding
+    # after append() or a change to a single child does not require dumping
+    # and sorting every child again. _child_contents is a list of the
+    # .contents of each child that is a Primitive when its encoding was
+    # cached, or None for other children, and _child_markers is a list of the
+    # markers from _encoding_marker() for the other children. _encodings_at
+    # is the _MUTATION_COUNT when _child_encodings was last known to match
+    # the children - when it still matches, no child can have been mutated.
+    _slot_names = (
+        '_child_encodings',
+        '_sorted_encodings',
+        '_child_contents',
+        '_child_markers',
+        '_encodings_at',
+    )
+    __slots__ = _slot_names if _USE_SLOTS else ()
+
     tag = 17
 
+    def __setitem__(self, key, value):
+        """
+        Allows overriding a child via index
+
+        :param key:
+            Integer index of child
+
+        :param value:
+            Native python datatype that will be passed to _child_spec to create
+            new child object
+        """
+
+        SequenceOf.__setitem__(self, key, value)
+        self._child_encodings = None
+
+    def __delitem__(self, key):
+        """
+        Allows removing a child via index
+
+        :param key:
+            Integer index of child
+        """
+
+        SequenceOf.__delitem__(self, key)
+        self._child_encodings = None
+
+    def append(self, value):
+        """
+        Allows adding a child to the end of the set
+
+        :param value:
+            Native python datatype that will be passed to _child_spec to create
+            new child object
+        """
+
+        current = self._encodings_at == _MUTATION_COUNT
+        SequenceOf.append(self, value)
+        # The only mutation since the encodings were current is the new child,
+        # which _set_contents() will insert on its own
+        if current:
+            self._encodings_at = _MUTATION_COUNT
+
     def _set_contents(self, force=False):
         """
         Encodes all child objects into the contents for this object.
 
         This method is overridden because a SetOf needs to be encoded by
-        sorting the child encodings.
+        sorting the child encodings. Unless force is True, the encodings from
+        the previous call are reused, so only children that were appended or
+        changed since then are inserted into the sorted list.
 
         :param force:
             Ensure all contents are in DER format instead of possibly using
@@ -4828,18 +5621,528 @@ class SetOf(SequenceOf):
 
         if self.children is None:
             self._parse_children()
+            self._child_encodings = None
+
+        # As with _is_mutated(), the count is read before the children are
+        # checked
+        mutation_count = _MUTATION_COUNT
+        encodings = self._child_encodings
+        if force or encodings is None:
+            encodings = [child.dump(force=force) for child in self]
+            sorted_encodings = sorted(encodings)
+            child_contents = [_primitive_contents(child) for child in self.children]
+            child_markers = [
+                None if contents is not None else _encoding_marker(child)[1]
+                for child, contents in zip(self.children, child_contents)
+            ]
 
-        child_encodings = []
-        for child in self:
-            child_encodings.append(child.dump(force=force))
-
-        self._contents = b''.join(sorted(child_encodings))
+        else:
+            sorted_encodings = self._sorted_encodings
+            child_contents = self._child_contents
+            child_markers = self._child_markers
+            sequences_current = self._encodings_at == mutation_count
+            # Primitive values changed via .set() get new contents, so only the
+            # other children need a closer look
+            children = self.children
+            candidates = [
+                index
+                for index, contents in enumerate(child_contents)
+                if contents is None or contents is not children[index].contents
+            ]
+            for index in candidates:
+                child = children[index]
+                if child.__class__ == tuple:
+                    continue
+                encoding = encodings[index]
+                # A re-encoded child, including one dumped on its own, has new
+                # contents. A Sequence or SequenceOf may also have mutations
+                # that have not been encoded yet, which are tracked.
+                sequence, marker = _encoding_marker(child)
+                if marker is not None and marker is child_markers[index]:
+                    if sequence is None or sequences_current or not sequence._is_mutated():
+                        continue
+                new_encoding = child.dump()
+                child_contents[index] = _primitive_contents(child)
+                child_markers[index] = None if child_contents[index] is not None else _encoding_marker(child)[1]
+                if new_encoding == encoding:
+                    continue
+                del sorted_encodings[bisect.bisect_left(sorted_encodings, encoding)]
+                encodings[index] = new_encoding
+                bisect.insort(sorted_encodings, new_encoding)
+
+            for index in range(len(encodings), len(self.children)):
+                child = self._lazy_child(index)
+                encoding = child.dump()
+                encodings.append(encoding)
+                contents = _primitive_contents(child)
+                child_contents.append(contents)
+                child_markers.append(None if contents is not None else _encoding_marker(child)[1])
+                bisect.insort(sorted_encodings, encoding)
+
+        self._child_encodings = encodings
+        self._sorted_encodings = sorted_encodings
+        self._child_contents = child_contents
+        self._child_markers = child_markers
+        self._encodings_at = mutation_count
+
+        self._contents = b''.join(sorted_encodings)
         self._mutated = False
         self._header = None
         if self._trailer != b'':
             self._trailer = b''
 
 
+class SequenceOfWriter(object):
+    """
+    Writes the DER encoding of a SequenceOf to a file object one child at a
+    time, so that very large values, such as the revoked certificates of a
+    CRL, never need to be held in memory.
+
+    Since the length in the header depends on every child, the encoded
+    children are buffered in a temporary file that is only kept in memory
+    while it is smaller than spool_size. Once close() is called, the header
+    is written to the file object, followed by the buffered children.
+    """
+
+    # The SequenceOf class being encoded
+    spec = None
+
+    # The number of children written so far
+    count = 0
+
+    # The number of bytes of encoded children written so far
+    length = 0
+
+    # An empty instance of spec, used to construct and tag children
+    _template = None
+
+    # The file object the final encoding is written to
+    _fileobj = None
+
+    # A tempfile.SpooledTemporaryFile of the encoded children, or None once
+    # the writer has been closed
+    _spool = None
+
+    def __init__(self, spec, fileobj, spool_size=1048576):
+        """
+        :param spec:
+            A class derived from SequenceOf - SetOf is not supported since its
+            children must be sorted by their encodings
+
+        :param fileobj:
+            A binary file object with a write() method
+
+        :param spool_size:
+            An integer of the number of bytes of encoded children to buffer in
+            memory before using a temporary file on disk
+
+        :raises:
+            TypeError - when spec is not a SequenceOf class, or is a SetOf class
+        """
+
+        if not isinstance(spec, type) or not issubclass(spec, SequenceOf):
+            raise TypeError(unwrap(
+                '''
+                spec must be a subclass of SequenceOf, not %s
+                ''',
+                type_name(spec)
+            ))
+
+        if issubclass(spec, SetOf):
+            raise TypeError(unwrap(
+                '''
+                spec can not be a subclass of SetOf since the children must be
+                sorted by their encodings
+                '''
+            ))
+
+        self.spec = spec
+        self._template = spec()
+        self._fileobj = fileobj
+        self._spool = tempfile.SpooledTemporaryFile(max_size=spool_size)
+
+    def write(self, value):
+        """
+        Encodes a child and adds it to the end of the sequence
+
+        :param value:
+            Native python datatype, or an instance of the spec's _child_spec
+
+        :raises:
+            ValueError - when the writer has been closed
+        """
+
+        if self._spool is None:
+            raise ValueError('The writer has been closed')
+
+        child = self._template._make_value(value)
+        for chunk in child.dump_iter():
+            self._spool.write(chunk)
+            self.length += len(chunk)
+        self.count += 1
+
+    def close(self):
+        """
+        Writes the header and all of the children to the file object. The
+        file object itself is not closed.
+
+        :raises:
+            ValueError - when the writer has already been closed
+
+        :return:
+            An integer of the number of bytes written to the file object
+        """
+
+        if self._spool is None:
+            raise ValueError('The writer has already been closed')
+
+        template = self._template
+        header = _dump_header(template.class_, template.method, template.tag, self.length)
+        if template.explicit is not None:
+            for class_, tag in template.explicit:
+                header = _dump_header(class_, 1, tag, len(header) + self.length) + header
+
+        self._fileobj.write(header)
+        self._spool.seek(0)
+        shutil.copyfileobj(self._spool, self._fileobj)
+        self._discard()
+
+        return len(header) + self.length
+
+    def _discard(self):
+        """
+        Removes the buffered children without writing them
+        """
+
+        if self._spool is not None:
+            self._spool.close()
+            self._spool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """
+        Writes the encoding when the block completes, or discards the buffered
+        children if an exception was raised
+        """
+
+        if exc_type is None and self._spool is not None:
+            self.close()
+        else:
+            self._discard()
+        return False
+
+
+class FieldPath(object):
+    """
+    A precompiled path of field names and indexes into an Asn1Value class, used
+    to extract a single value from encoded data. The headers of the values
+    along the path are parsed to skip directly to the requested value, so no
+    Sequence or SequenceOf objects are constructed for the intermediate
+    values.
+
+    Steps that depend on other values, such as fields with a spec determined
+    by an OID, or that go through a Set or Choice, construct the value
+    containing them and continue by indexing it.
+    """
+
+    # The Asn1Value class of the encoded data
+    spec = None
+
+    # A list of the field names and indexes in the path
+    _keys = None
+
+    # A list of tuples of the compiled information for each step in the path
+    _steps = None
+
+    def __init__(self, spec, path):
+        """
+        :param spec:
+            An Asn1Value class the encoded data will be an instance of
+
+        :param path:
+            A unicode string of field names and SequenceOf indexes separated
+            by ".", e.g. "tbs_certificate.extensions.0", or a list of unicode
+            string field names and integer indexes
+
+        :raises:
+            KeyError - when a field name in the path is not defined
+            TypeError - when spec is not an Asn1Value class, or path is not a unicode string or list
+            ValueError - when path is empty
+        """
+
+        if not isinstance(spec, type) or not issubclass(spec, Asn1Value):
+            raise TypeError(unwrap(
+                '''
+                spec must be a subclass of Asn1Value, not %s
+                ''',
+                type_name(spec)
+            ))
+
+        if isinstance(path, (str_cls, str)):
+            keys = [int(key) if _INDEX_RE.match(key) else key for key in path.split('.')]
+        elif isinstance(path, (list, tuple)):
+            keys = list(path)
+        else:
+            raise TypeError(unwrap(
+                '''
+                path must be a unicode string, list or tuple, not %s
+                ''',
+                type_name(path)
+            ))
+
+        if not keys or keys == ['']:
+            raise ValueError('path must contain at least one field name or index')
+
+        self.spec = spec
+        self._keys = keys
+        self._steps = []
+
+        current_spec = spec
+        current_params = {}
+        for key in keys:
+            step = self._compile_step(current_spec, current_params, key)
+            self._steps.append(step)
+            if step[0] is None:
+                break
+            current_spec, current_params = step[3:5]
+
+    def _compile_step(self, spec, params, key):
+        """
+        Determines how to locate a child of a value
+
+        :param spec:
+            The Asn1Value class of the value
+
+        :param params:
+            A dict of params used with the spec
+
+        :param key:
+            A unicode string field name or integer index of the child
+
+        :return:
+            A 6-element tuple of:
+             - None if the child must be found by constructing the value,
+               otherwise "field" for a Sequence field or "item" for a
+               SequenceOf child
+             - The integer index of the field or child
+             - A tuple of the explicit tagging of the value, or None
+             - The Asn1Value class of the child
+             - A dict of params for the child
+             - The unicode string name of the child field, or None
+        """
+
+        fallback = (None, None, None, None, None, None)
+
+        if spec is None or issubclass(spec, Set):
+            return fallback
+
+        if issubclass(spec, Sequence):
+            # Constructing an instance makes sure _setup() has been run
+            explicit = spec(**params).explicit
+            if not isinstance(key, str_cls) or key not in spec._field_map:
+                raise KeyError(unwrap(
+                    '''
+                    No field named "%s" defined for %s
+                    ''',
+                    key,
+                    type_name(spec)
+                ))
+            index = spec._field_map[key]
+            if spec._precomputed_specs[index] is None:
+                return fallback
+            # Earlier optional fields with dynamic specs may not be matchable
+            # by their encoded class and tag alone
+            for prev_index in range(0, index):
+                prev_params = spec._fields[prev_index][2]
+                if spec._precomputed_specs[prev_index] is None and \
+                        ('optional' in prev_params or 'default' in prev_params):
+                    return fallback
+            name, field_spec, field_params = spec._fields[index]
+            return ('field', index, explicit, field_spec, field_params, name)
+
+        if issubclass(spec, SequenceOf) and isinstance(key, int_types):
+            explicit = spec(**params).explicit
+            return ('item', key, explicit, spec._child_spec, {}, None)
+
+        return fallback
+
+    def extract(self, encoded_data, raw=False):
+        """
+        Extracts the value at the path from encoded data
+
+        :param encoded_data:
+            A byte string of BER or DER-encoded data of the spec. On Python 3
+            a memoryview may also be passed.
+
+        :param raw:
+            If the encoded bytes of the value should be returned instead of an
+            Asn1Value object
+
+        :raises:
+            ValueError - when the encoded data is not valid, or a required field is missing
+            IndexError - when a SequenceOf index is out of range
+            TypeError - when encoded_data is not a byte string
+
+        :return:
+            An Asn1Value object, or a byte string if raw is True. If an
+            optional or default field is absent, VOID or the default value is
+            returned, or None if raw is True.
+        """
+
+        if not isinstance(encoded_data, byte_like_types):
+            raise TypeError('encoded_data must be a byte string, not %s' % type_name(encoded_data))
+
+        parts, _ = _parse(encoded_data, len(encoded_data))
+        spec = self.spec
+        params = None
+
+        for step_num, (kind, index, explicit, child_spec, child_params, name) in enumerate(self._steps):
+            contents = None
+            if kind is not None:
+                contents = self._unwrap_explicit(parts, explicit)
+
+            # Construct the value and continue with normal indexing if the
+            # child can not be located by its encoding alone
+            if contents is None:
+                value = _build(*parts, spec=spec, spec_params=params)
+                for key in self._keys[step_num:]:
+                    value = value[key]
+                if raw:
+                    return None if value is VOID else value.dump()
+                return value
+
+            if kind == 'item':
+                parts = self._find_item(contents, index)
+            else:
+                parts = self._find_field(contents, spec, index)
+                if parts is None:
+                    if 'default' in child_params:
+                        return None if raw else child_spec(**child_params)
+                    if 'optional' in child_params:
+                        return None if raw else VOID
+                    raise ValueError(unwrap(
+                        '''
+                        Field "%s" is missing from structure
+                        ''',
+                        name
+                    ))
+
+            spec = child_spec
+            params = child_params
+
+        if raw:
+            return b''.join(parts[3:6])
+        return _build(*parts, spec=spec, spec_params=params)
+
+    def _unwrap_explicit(self, parts, explicit):
+        """
+        Removes any explicit tagging from a parsed value
+
+        :param parts:
+            A 6-element tuple from _parse() of the value
+
+        :param explicit:
+            None or a tuple of 2-element tuples of the explicit class and tag
+
+        :return:
+            The contents of the innermost value, or None if the tagging does
+            not match
+        """
+
+        if explicit is not None:
+            for class_, tag in reversed(explicit):
+                if parts[0] != class_ or parts[2] != tag or parts[1] != 1:
+                    return None
+                contents = parts[4]
+                parts, _ = _parse(contents, len(contents))
+        return parts[4]
+
+    def _find_item(self, contents, index):
+        """
+        Locates a child of a SequenceOf
+
+        :param contents:
+            The encoded contents of the SequenceOf
+
+        :param index:
+            The integer index of the child
+
+        :return:
+            A 6-element tuple from _parse() of the child
+        """
+
+        contents_length = len(contents)
+        if index < 0:
+            # Negative indexes require the number of children
+            children = []
+            pointer = 0
+            while pointer < contents_length:
+                parts, pointer = _parse(contents, contents_length, pointer=pointer)
+                children.append(parts)
+            return children[index]
+
+        pointer = 0
+        count = 0
+        while pointer < contents_length:
+            parts, pointer = _parse(contents, contents_length, pointer=pointer)
+            if count == index:
+                return parts
+            count += 1
+        raise IndexError('list index out of range')
+
+    def _find_field(self, contents, spec, index):
+        """
+        Locates a field of a Sequence, following the same rules for optional
+        and default fields as Sequence._parse_children()
+
+        :param contents:
+            The encoded contents of the Sequence
+
+        :param spec:
+            The Sequence class
+
+        :param index:
+            The integer index of the field in _fields
+
+        :return:
+            A 6-element tuple from _parse() of the field, or None if the
+            field is absent
+        """
+
+        contents_length = len(contents)
+        pointer = 0
+        field = 0
+        parts = None
+        while field <= index:
+            if parts is None:
+                if pointer >= contents_length:
+                    return None
+                parts, pointer = _parse(contents, contents_length, pointer=pointer)
+
+            matcher = spec._field_matchers[field]
+            if matcher is not None:
+                if matcher is False:
+                    _, field_spec, field_params = spec._fields[field]
+                    present = _field_matches(spec._field_ids[field], field_spec, field_params, parts)
+                else:
+                    present = (parts[0], parts[2]) in matcher
+
+                if not present:
+                    if field == index:
+                        return None
+                    field += 1
+                    continue
+
+            if field == index:
+                return parts
+            field += 1
+            parts = None
+
+        return None
+
+
 class EmbeddedPdv(Sequence):
     """
     A sequence structure
@@ -4897,6 +6200,76 @@ class AbstractTime(AbstractString):
     Represents a time from ASN.1 as a Python datetime.datetime object
     """
 
+    # A _cache.BoundedCache of encoded contents to native values, set on
+    # UTCTime and GeneralizedTime, or None when the cache is disabled - see
+    # enable_cache()
+    _cache = None
+
+    @classmethod
+    def enable_cache(cls, max_size=4096):
+        """
+        Enables caches of the native values of UTCTime and GeneralizedTime
+        objects, keyed by their encoded contents. Since datetime objects are
+        immutable, values that repeat, such as the revocation dates of a
+        large CRL that is read more than once, are only parsed once and share
+        a single object. Each miss adds the cost of a lookup and insertion,
+        so the cache only helps when max_size is large enough for most values
+        to be found again before they are evicted.
+
+        :param max_size:
+            An integer of the maximum number of values to cache for each of
+            UTCTime and GeneralizedTime - once full, the least recently used
+            entry is removed for each new value
+
+        :raises:
+            ValueError - when max_size is less than 1
+        """
+
+        UTCTime._cache = BoundedCache(max_size)
+        GeneralizedTime._cache = BoundedCache(max_size)
+
+    @classmethod
+    def disable_cache(cls):
+        """
+        Disables and clears the caches enabled by enable_cache()
+        """
+
+        UTCTime._cache = None
+        GeneralizedTime._cache = None
+
+    @classmethod
+    def cache_info(cls):
+        """
+        :return:
+            None if the caches are disabled, otherwise a dict with the integer
+            keys "hits", "misses", "size" and "max_size". The hits, misses
+            and size are totals for UTCTime and GeneralizedTime, while the
+            max_size applies to each.
+        """
+
+        if UTCTime._cache is None:
+            return None
+        info = UTCTime._cache.info()
+        generalized_info = GeneralizedTime._cache.info()
+        for key in ('hits', 'misses', 'size'):
+            info[key] += generalized_info[key]
+        return info
+
+    def _fast_datetime(self, contents):
+        """
+        Creates a datetime object from the most common encoding of the time,
+        without using a regular expression
+
+        :param contents:
+            A byte string of the encoded contents
+
+        :return:
+            An aware datetime.datetime object, or None if the contents are not
+            in the common format
+        """
+
+        return None
+
     @property
     def _parsed_time(self):
         """
@@ -4976,16 +6349,27 @@ class AbstractTime(AbstractString):
             return None
 
         if self._native is None:
-            parsed = self._parsed_time
+            contents = self.contents
+            cache = self._cache
+            if cache is not None:
+                self._native = cache.get(contents)
+                if self._native is not None:
+                    return self._native
+
+            value = self._fast_datetime(contents)
+            if value is None:
+                parsed = self._parsed_time
 
-            fraction = parsed.pop('fraction', 0)
+                fraction = parsed.pop('fraction', 0)
 
-            value = self._get_datetime(parsed)
+                value = self._get_datetime(parsed)
 
-            if fraction:
-                value += timedelta(microseconds=fraction)
+                if fraction:
+                    value += timedelta(microseconds=fraction)
 
             self._native = value
+            if cache is not None:
+                cache.set(contents, value)
 
         return self._native
 
@@ -5056,6 +6440,33 @@ class UTCTime(AbstractTime):
         # time that .native is called
         self._native = None
 
+    def _fast_datetime(self, contents):
+        """
+        Creates a datetime object from contents in the YYMMDDHHMMSSZ format
+        required by DER, without using a regular expression
+
+        :param contents:
+            A byte string of the encoded contents
+
+        :return:
+            An aware datetime.datetime object, or None if the contents are in
+            another format
+        """
+
+        if len(contents) != 13 or contents[12:] != b'Z' or not contents[:12].isdigit():
+            return None
+
+        year = int(contents[0:2])
+        return datetime(
+            year + (2000 if year < 50 else 1900),
+            int(contents[2:4]),
+            int(contents[4:6]),
+            int(contents[6:8]),
+            int(contents[8:10]),
+            int(contents[10:12]),
+            tzinfo=timezone.utc
+        )
+
     def _get_datetime(self, parsed):
         """
         Create a datetime object from the parsed time.
@@ -5155,6 +6566,35 @@ class GeneralizedTime(AbstractTime):
         # time that .native is called
         self._native = None
 
+    def _fast_datetime(self, contents):
+        """
+        Creates a datetime object from contents in the YYYYMMDDHHMMSSZ format,
+        without using a regular expression
+
+        :param contents:
+            A byte string of the encoded contents
+
+        :return:
+            An aware datetime.datetime object, or None if the contents are in
+            another format or the year is 0
+        """
+
+        if len(contents) != 15 or contents[14:] != b'Z' or not contents[:14].isdigit():
+            return None
+
+        year = int(contents[0:4])
+        if year == 0:
+            return None
+        return datetime(
+            year,
+            int(contents[4:6]),
+            int(contents[6:8]),
+            int(contents[8:10]),
+            int(contents[10:12]),
+            int(contents[12:14]),
+            tzinfo=timezone.utc
+        )
+
     def _get_datetime(self, parsed):
         """
         Create a datetime object from the parsed time.
@@ -5334,6 +6774,280 @@ def _fix_tagging(value, params):
     return value
 
 
+def _freeze_child(value):
+    """
+    Freezes a descendant of a value that is being frozen. Unlike calling
+    .freeze(), a Sequence or SequenceOf does not cache its own copy of its
+    encoding.
+
+    :param value:
+        An Asn1Value object
+    """
+
+    if not value._frozen:
+        value._freeze()
+        value._frozen = True
+
+
+def _note_mutation():
+    """
+    Records that a Sequence or SequenceOf has been mutated, invalidating the
+    results of previous calls to _is_mutated()
+    """
+
+    global _MUTATION_COUNT
+    _MUTATION_COUNT += 1
+
+
+def _primitive_contents(child):
+    """
+    Returns the contents of a child of a SetOf if it is a Primitive, used to
+    detect a change via .set() without dumping the child
+
+    :param child:
+        An Asn1Value object, or a 6-element tuple from _parse()
+
+    :return:
+        The .contents of the child, or None if it is not a Primitive
+    """
+
+    if isinstance(child, Primitive):
+        return child.contents
+    return None
+
+
+def _encoding_marker(child):
+    """
+    Finds the object holding the cached encoding of a child of a SetOf, looking
+    through Choice and parsed Any values. The object is replaced whenever the
+    value is re-encoded, so comparing it by identity detects a change without
+    dumping the child.
+
+    :param child:
+        An Asn1Value object, or a 6-element tuple from _parse()
+
+    :return:
+        A 2-element tuple of the Sequence or SequenceOf holding the encoding,
+        which may also have mutations that are not encoded yet, or None, and
+        the marker object, or None if changes can not be detected
+    """
+
+    while True:
+        if isinstance(child, Choice):
+            child = child.chosen
+        elif isinstance(child, Any) and child._parsed is not None:
+            child = child._parsed[0]
+        else:
+            break
+
+    if isinstance(child, (Sequence, SequenceOf)):
+        return (child, child._contents)
+    if isinstance(child, (Primitive, Any)):
+        return (None, child.contents)
+    return (None, None)
+
+
+def _splice_contents(value):
+    """
+    Re-encodes the contents of a mutated Sequence or SequenceOf. The cached
+    encodings of unchanged children are reused and only the headers of mutated
+    descendants are re-encoded, so the encoded data is only copied once when
+    all of the segments are joined. The contents of the mutated descendants
+    become views into the new contents. No cached encodings are changed until
+    all of the segments have been built, so a descendant that raises an
+    exception leaves the tree as it was.
+
+    :param value:
+        A Sequence or SequenceOf object
+    """
+
+    segments = []
+    # Tuples of (child, header, index of first contents segment, index after last)
+    spans = []
+    value._content_segments(segments, spans)
+    contents = b''.join(segments)
+
+    value._contents = contents
+    value._mutated = False
+    value._header = None
+    if value._trailer != b'':
+        value._trailer = b''
+
+    if spans:
+        offsets = [0]
+        for segment in segments:
+            offsets.append(offsets[-1] + len(segment))
+        view = _byte_view(contents)
+        for child, header, start, end in spans:
+            child._contents = view[offsets[start]:offsets[end]]
+            child._header = header
+            child._mutated = False
+            if child._trailer != b'':
+                child._trailer = b''
+
+
+def _append_segments(child, segments, spans):
+    """
+    Appends the encoding of a child of a Sequence or SequenceOf to a list of
+    segments, recursing into mutated Sequence and SequenceOf values
+
+    :param child:
+        An Asn1Value object, or a 6-element tuple from _parse()
+
+    :param segments:
+        A list to append byte strings and memoryviews to
+
+    :param spans:
+        A list to append a 4-element tuple to for each mutated child - see
+        _splice_contents(). If None, the mutated children are encoded without
+        updating their cached encodings.
+
+    :return:
+        An integer of the number of bytes appended to segments
+    """
+
+    if child.__class__ == tuple:
+        segments.extend(child[3:6])
+        return len(child[3]) + len(child[4]) + len(child[5])
+
+    # Set and SetOf sort their children when encoding, so they are re-encoded
+    # as a whole
+    spliceable = isinstance(child, (Sequence, SequenceOf)) and not isinstance(child, (Set, SetOf))
+    header = child._header
+    if spliceable and child.children is not None and (header is None or header[-1:] != b'\x80'):
+        if child._is_mutated():
+            header_index = len(segments)
+            segments.append(None)
+            length = child._content_segments(segments, spans)
+
+            header = _dump_header(child.class_, child.method, child.tag, length)
+            if child.explicit is not None:
+                for class_, tag in child.explicit:
+                    header = _dump_header(class_, 1, tag, len(header) + length) + header
+
+            segments[header_index] = header
+            if spans is not None:
+                spans.append((child, header, header_index + 1, len(segments)))
+            return len(header) + length
+
+        if header is not None and child._contents is not None:
+            segments.append(header)
+            segments.append(child._contents)
+            segments.append(child._trailer)
+            return len(header) + len(child._contents) + len(child._trailer)
+
+    encoded = child.dump()
+    segments.append(encoded)
+    return len(encoded)
+
+
+def _build_field_matcher(spec, params, field_id):
+    """
+    Precomputes how _parse_children() determines if an encoded value is for an
+    optional or default field of a Sequence, or if the field is absent
+
+    :param spec:
+        An Asn1Value class of the field spec, or None if it is determined when
+        parsing via a spec callback or OID
+
+    :param params:
+        A dict of params for the field spec
+
+    :param field_id:
+        A 2-element tuple of the (class_, tag) from _build_id_tuple()
+
+    :return:
+        None if the field is always present, a frozenset of the (class_, tag)
+        tuples that match the field, or False if _field_matches() must be
+        called for each encoded value
+    """
+
+    if not params or ('optional' not in params and 'default' not in params):
+        return None
+
+    if spec is None:
+        return False
+
+    if spec == Any:
+        return None
+
+    if not issubclass(spec, Choice):
+        return frozenset([field_id])
+
+    # Expand the alternatives of the choice so parsing is a set lookup instead
+    # of constructing and validating a tester object for each value
+    choice_ids = _choice_ids(spec, params)
+    if choice_ids is None:
+        return False
+
+    return frozenset([field_id]) | choice_ids
+
+
+def _choice_ids(spec, params):
+    """
+    Determines the (class_, tag) tuples of the alternatives of a Choice field
+
+    :param spec:
+        A Choice class
+
+    :param params:
+        A dict of params for the field spec
+
+    :return:
+        A frozenset of 2-element (class_, tag) tuples, or None if the field
+        can not be identified by the class and tag of the encoded value alone
+    """
+
+    try:
+        tester = spec(**params)
+    except (ValueError, TypeError):
+        return None
+
+    # Explicitly tagged choices require the inner value to be parsed to be
+    # validated, and choices with a tag may have been implicitly tagged
+    if tester.explicit is not None or tester.tag is not None:
+        return None
+
+    return frozenset(tester._id_map)
+
+
+def _field_matches(field_id, field_spec, field_params, parts):
+    """
+    Determines if an encoded value is for an optional or default field of a
+    Sequence when it could not be precomputed by _build_field_matcher()
+
+    :param field_id:
+        A 2-element tuple of the (class_, tag) from _build_id_tuple()
+
+    :param field_spec:
+        An Asn1Value class of the field spec
+
+    :param field_params:
+        A dict of params for the field spec
+
+    :param parts:
+        A 6-element tuple from _parse() of the encoded value
+
+    :return:
+        A bool - if the encoded value is for the field
+    """
+
+    if field_id == (parts[0], parts[2]) or field_spec == Any:
+        return True
+
+    # See if the value is a valid choice before assuming that we have a
+    # missing optional or default value
+    if issubclass(field_spec, Choice):
+        try:
+            tester = field_spec(**field_params)
+            tester.validate(parts[0], parts[2], parts[4])
+            return True
+        except (ValueError):
+            pass
+
+    return False
+
+
 def _build_id_tuple(params, spec):
     """
     Builds a 2-element tuple used to identify fields by grabbing the class_
@@ -5379,6 +7093,93 @@ def _build_id_tuple(params, spec):
     return (required_class, required_tag)
 
 
+def _encode_oid(dotted):
+    """
+    Encodes the contents of an object identifier
+
+    :param dotted:
+        A unicode string of the OID in dotted integer form
+
+    :raises:
+        ValueError - when the first or second arc is out of range
+
+    :return:
+        A byte string of the encoded contents
+    """
+
+    parts = dotted.split('.')
+    first = int(parts[0])
+    if len(parts) > 1:
+        second = int(parts[1])
+        if first > 2:
+            raise ValueError(unwrap(
+                '''
+                First arc must be one of 0, 1 or 2, not %s
+                ''',
+                repr(first)
+            ))
+        elif first < 2 and second >= 40:
+            raise ValueError(unwrap(
+                '''
+                Second arc must be less than 40 if first arc is 0 or
+                1, not %s
+                ''',
+                repr(second)
+            ))
+        # The first two parts are merged into a single subidentifier
+        arcs = [(first * 40) + second] + [int(part) for part in parts[2:]]
+    else:
+        arcs = []
+
+    output = bytearray()
+    for arc in arcs:
+        # Base-128 digits, least significant first, with the continuation
+        # bit set on all but the last digit of the subidentifier
+        digits = [arc & 0x7F]
+        arc >>= 7
+        while arc > 0:
+            digits.append(0x80 | (arc & 0x7F))
+            arc >>= 7
+        digits.reverse()
+        output.extend(digits)
+    return bytes(output)
+
+
+def _decode_oid(contents):
+    """
+    Decodes the contents of an object identifier
+
+    :param contents:
+        A byte string or memoryview of the encoded contents
+
+    :return:
+        A unicode string of the OID in dotted integer form
+    """
+
+    arcs = []
+    part = 0
+    for byte in bytearray(contents):
+        part = (part << 7) | (byte & 0x7F)
+        # Last byte in subidentifier has the eighth bit set to 0
+        if byte < 0x80:
+            arcs.append(part)
+            part = 0
+
+    if not arcs:
+        return ''
+
+    first = arcs[0]
+    if first >= 80:
+        output = ['2', str_cls(first - 80)]
+    elif first >= 40:
+        output = ['1', str_cls(first - 40)]
+    else:
+        output = ['0', str_cls(first)]
+    for arc in arcs[1:]:
+        output.append(str_cls(arc))
+    return '.'.join(output)
+
+
 def _int_to_bit_tuple(value, bits):
     """
     Format value as a tuple of 1s and 0s.
@@ -5482,6 +7283,15 @@ def _build(class_, method, tag, header, contents, trailer, spec=None, spec_param
     if header is None:
         return VOID
 
+    # When parsing from a memoryview, only Sequence and SequenceOf values keep
+    # a view of their contents, since they lazily parse children from it. All
+    # other values require byte strings.
+    if header.__class__ is memoryview_cls:
+        header = header.tobytes()
+        container_spec = spec if spec is not None else _UNIVERSAL_SPECS.get(tag)
+        if container_spec is None or not issubclass(container_spec, (Sequence, SequenceOf)):
+            contents = contents.tobytes()
+
     header_set = False
 
     # If an explicit specification was passed in, make sure it matches
@@ -5668,12 +7478,32 @@ def _build(class_, method, tag, header, contents, trailer, spec=None, spec_param
     return value
 
 
+def _byte_view(encoded_data):
+    """
+    Creates a memoryview of single bytes to use for zero-copy parsing
+
+    :param encoded_data:
+        A byte string or memoryview of BER-encoded data
+
+    :return:
+        A memoryview on Python 3, otherwise encoded_data
+    """
+
+    if memoryview_cls is None:
+        return encoded_data
+
+    view = memoryview_cls(encoded_data)
+    if view.format != 'B' or view.ndim != 1:
+        view = view.cast('B')
+    return view
+
+
 def _parse_build(encoded_data, pointer=0, spec=None, spec_params=None, strict=False):
     """
     Parses a byte string generically, or using a spec with optional params
 
     :param encoded_data:
-        A byte string that contains BER-encoded data
+        A byte string or memoryview that contains BER-encoded data
 
     :param pointer:
         The index in the byte string to parse from
@@ -24,6 +24,7 @@ from .core import (
     ParsableOctetString,
     Sequence,
     SequenceOf,
+    VOID,
 )
 from .x509 import (
     AuthorityInfoAccessSyntax,
@@ -35,6 +36,8 @@ from .x509 import (
     ReasonFlags,
     Time,
 )
+from .parser import _parse
+from .util import int_from_bytes
 
 
 # The structures in this file are taken from https://tools.ietf.org/html/rfc5280
@@ -303,6 +306,7 @@ class CertificateList(Sequence):
     _delta_crl_distribution_points = None
     _sha1 = None
     _sha256 = None
+    _serial_index = None
 
     def _set_extensions(self):
         """
@@ -512,6 +516,72 @@ class CertificateList(Sequence):
 
         return self['signature'].native
 
+    def build_serial_index(self):
+        """
+        Builds a dict of the serial numbers of the revoked certificates,
+        directly from the encoded INTEGER values, without constructing
+        RevokedCertificate objects. The index is cached and used by
+        .is_revoked(). Call this method again to rebuild the index if the
+        revoked_certificates field is modified.
+
+        :return:
+            A dict with integer serial number keys and integer values of the
+            index of the entry in the revoked_certificates field
+        """
+
+        index = {}
+        revoked_certificates = self['tbs_cert_list']['revoked_certificates']
+        if revoked_certificates is not VOID:
+            # Read the unparsed contents where possible so zero-copy values
+            # are not copied into a byte string
+            if revoked_certificates.children is None:
+                contents = revoked_certificates._contents
+            else:
+                contents = revoked_certificates.contents
+            contents_length = len(contents) if contents is not None else 0
+            pointer = 0
+            entry_num = 0
+            while pointer < contents_length:
+                entry, pointer = _parse(contents, contents_length, pointer=pointer)
+                entry_contents = entry[4]
+                serial, _ = _parse(entry_contents, len(entry_contents))
+                index.setdefault(int_from_bytes(serial[4], signed=True), entry_num)
+                entry_num += 1
+
+        self._serial_index = index
+        return index
+
+    def is_revoked(self, serial):
+        """
+        Checks if a certificate serial number is listed in the revoked
+        certificates, using the index from .build_serial_index()
+
+        :param serial:
+            An integer of the certificate serial number
+
+        :return:
+            A boolean
+        """
+
+        if self._serial_index is None:
+            self.build_serial_index()
+        return serial in self._serial_index
+
+    def iter_revoked(self):
+        """
+        Iterates over the revoked certificates one at a time, without building
+        the list of children of the revoked_certificates field. Useful for
+        very large CRLs, especially when combined with CertificateList.load_file().
+
+        :return:
+            A generator of RevokedCertificate objects
+        """
+
+        revoked_certificates = self['tbs_cert_list']['revoked_certificates']
+        if revoked_certificates is VOID:
+            return iter(())
+        return revoked_certificates.iter_children()
+
     @property
     def sha1(self):
         """
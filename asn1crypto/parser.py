@@ -7,20 +7,27 @@ following items:
  - emit()
  - parse()
  - peek()
+ - scan()
+ - read_tlv_async()
+ - StreamParser()
 
 Other type classes are defined that help compose the types listed above.
 """
 
 from __future__ import unicode_literals, division, absolute_import, print_function
 
+from array import array
+import os
 import sys
 
-from ._types import byte_cls, chr_cls, type_name
+from ._types import byte_cls, byte_like_types, chr_cls, int_types, type_name
 from .util import int_from_bytes, int_to_bytes
 
 _PY2 = sys.version_info <= (3,)
 _INSUFFICIENT_DATA_MESSAGE = 'Insufficient data - %s bytes requested but only %s available'
 _MAX_DEPTH = 10
+# The array typecode used for offsets and tags in the output of scan()
+_SCAN_TYPECODE = 'q' if sys.version_info >= (3, 3) else 'l'
 
 
 def emit(class_, method, tag, contents):
@@ -81,7 +88,9 @@ def parse(contents, strict=False):
     .load() class method.
 
     :param contents:
-        A byte string of BER/DER-encoded data
+        A byte string of BER/DER-encoded data. On Python 3 a memoryview may be
+        passed, in which case the header, contents and trailer will be
+        memoryview slices of it.
 
     :param strict:
         A boolean indicating if trailing data should be forbidden - if so, a
@@ -101,7 +110,7 @@ def parse(contents, strict=False):
          - 5: byte string trailer
     """
 
-    if not isinstance(contents, byte_cls):
+    if not isinstance(contents, byte_like_types):
         raise TypeError('contents must be a byte string, not %s' % type_name(contents))
 
     contents_len = len(contents)
@@ -120,7 +129,8 @@ def peek(contents):
     value is a concatenation of multiple values.
 
     :param contents:
-        A byte string of BER/DER-encoded data
+        A byte string of BER/DER-encoded data. On Python 3 a memoryview may
+        also be passed.
 
     :raises:
         ValueError - when the contents do not contain an ASN.1 header or are truncated in some way
@@ -130,19 +140,340 @@ def peek(contents):
         An integer with the number of bytes occupied by the ASN.1 value
     """
 
-    if not isinstance(contents, byte_cls):
+    if not isinstance(contents, byte_like_types):
         raise TypeError('contents must be a byte string, not %s' % type_name(contents))
 
     info, consumed = _parse(contents, len(contents))
     return consumed
 
 
+def scan(contents, max_depth=None):
+    """
+    Finds the header information and offsets of every ASN.1 value in a byte
+    string of BER/DER-encoded data, descending into constructed values,
+    without creating any Python objects for the values
+
+    :param contents:
+        A byte string of BER/DER-encoded data, which may contain multiple
+        concatenated values. On Python 3 a memoryview may also be passed.
+
+    :param max_depth:
+        An integer of the maximum depth to descend to - 0 only scans the
+        top-level values. None to scan all values.
+
+    :raises:
+        ValueError - when the contents are not valid BER or are truncated in some way
+        TypeError - when contents is not a byte string
+
+    :return:
+        A 7-element tuple of array.array objects, with one entry per value,
+        in the order the values appear in the encoding:
+         - 0: integer depth
+         - 1: integer class (0 to 3)
+         - 2: integer method
+         - 3: integer tag
+         - 4: integer offset of the header
+         - 5: integer offset of the contents
+         - 6: integer length of the contents, excluding any end-of-contents
+              trailer of an indefinite-length value
+    """
+
+    if not isinstance(contents, byte_like_types):
+        raise TypeError('contents must be a byte string, not %s' % type_name(contents))
+
+    depths = array(_SCAN_TYPECODE)
+    classes = array('B')
+    methods = array('B')
+    tags = array(_SCAN_TYPECODE)
+    header_offsets = array(_SCAN_TYPECODE)
+    contents_offsets = array(_SCAN_TYPECODE)
+    contents_lengths = array(_SCAN_TYPECODE)
+
+    pointer = 0
+    end = len(contents)
+    depth = 0
+    # The resume information for the values containing the current one
+    stack = []
+
+    while True:
+        if pointer >= end:
+            if not stack:
+                break
+            pointer, end, depth = stack.pop()
+            continue
+
+        header = _parse_header(contents, end, pointer)
+        if header is None:
+            # Produces the appropriate insufficient data error
+            _parse(contents, end, pointer, lengths_only=True)
+        class_, method, tag, contents_start, length = header
+
+        if length is None:
+            _, value_end = _parse(contents, end, pointer, lengths_only=True)
+            contents_end = value_end - 2
+        else:
+            contents_end = value_end = contents_start + length
+            if value_end > end:
+                raise ValueError(_INSUFFICIENT_DATA_MESSAGE % (length, end - contents_start))
+
+        depths.append(depth)
+        classes.append(class_)
+        methods.append(method)
+        tags.append(tag)
+        header_offsets.append(pointer)
+        contents_offsets.append(contents_start)
+        contents_lengths.append(contents_end - contents_start)
+
+        if method == 1 and contents_end > contents_start and (max_depth is None or depth < max_depth):
+            stack.append((value_end, end, depth))
+            pointer = contents_start
+            end = contents_end
+            depth += 1
+        else:
+            pointer = value_end
+
+    return (depths, classes, methods, tags, header_offsets, contents_offsets, contents_lengths)
+
+
+def read_tlv_async(reader, max_size=None, spec=None):
+    """
+    Reads exactly one ASN.1 BER/DER-encoded value from an asyncio stream.
+    Only the bytes of the value are consumed from the reader, using the length
+    octets to determine how much to read, so further values may be read from
+    the same stream afterwards.
+
+    This must be called while the event loop is running, and the result
+    awaited, e.g. "value = await read_tlv_async(reader)". Requires Python 3.5
+    or newer.
+
+    :param reader:
+        An asyncio.StreamReader object, or any object with a compatible
+        readexactly() coroutine method
+
+    :param max_size:
+        An integer of the maximum number of bytes the value may occupy, or
+        None for no limit
+
+    :param spec:
+        An optional Asn1Value class to load the value with
+
+    :raises:
+        ValueError - when the data is not valid BER, is truncated, or exceeds max_size
+
+    :return:
+        An asyncio.Future that resolves to None if the stream was at EOF, a
+        6-element tuple in the same format as returned by parse(), or an
+        instance of spec
+    """
+
+    import asyncio
+
+    loop = asyncio.get_event_loop()
+    result = loop.create_future()
+    stream = StreamParser(max_size=max_size)
+    # The in-flight readexactly() task, in a list so the callbacks can
+    # replace it
+    reading = [None]
+
+    def read_more():
+        task = loop.create_task(reader.readexactly(stream._bytes_needed()))
+        task.add_done_callback(on_read)
+        reading[0] = task
+
+    def on_result_done(result):
+        # When the result is cancelled, such as by asyncio.wait_for(), the
+        # read must be stopped too, otherwise it consumes bytes from the stream
+        if result.cancelled() and reading[0] is not None:
+            reading[0].cancel()
+
+    def on_read(task):
+        if result.cancelled():
+            return
+        if task.cancelled():
+            result.cancel()
+            return
+
+        try:
+            try:
+                data = task.result()
+            except asyncio.IncompleteReadError as e:
+                if not e.partial and not stream.pending:
+                    result.set_result(None)
+                    return
+                raise ValueError(_INSUFFICIENT_DATA_MESSAGE % (e.expected, len(e.partial)))
+
+            values = stream.feed(data)
+            if not values:
+                read_more()
+                return
+
+            value = values[0]
+            if spec is not None:
+                value = spec.load(b''.join(value[3:6]))
+
+        except Exception as e:
+            result.set_exception(e)
+            return
+
+        result.set_result(value)
+
+    result.add_done_callback(on_result_done)
+    read_more()
+    return result
+
+
+class StreamParser(object):
+    """
+    Incrementally parses ASN.1 BER/DER-encoded values from chunks of data, such
+    as those read from a socket. Each complete top-level value is returned
+    from .feed() as soon as all of its bytes have been received, including
+    indefinite-length values split across chunks.
+
+    Only the headers of incomplete values are examined while waiting for more
+    data, so no value is re-parsed from the start on every chunk.
+    """
+
+    # The maximum number of bytes allowed for a single top-level value
+    _max_size = None
+
+    def __init__(self, max_size=None):
+        """
+        :param max_size:
+            An integer of the maximum number of bytes a single top-level value
+            may occupy, or None for no limit. A ValueError is raised by
+            .feed() as soon as a value is known to exceed this limit.
+        """
+
+        if max_size is not None and not isinstance(max_size, int_types):
+            raise TypeError('max_size must be an integer, not %s' % type_name(max_size))
+
+        self._max_size = max_size
+        self._buffer = bytearray()
+        self._reset()
+
+    def _reset(self):
+        """
+        Resets the scanning state to the start of the buffer
+        """
+
+        # The offset of the next header to examine in the current value
+        self._pointer = 0
+        # The number of indefinite-length values currently open
+        self._open = 0
+        # The end offset of the current value, once known
+        self._end = None
+
+    @property
+    def pending(self):
+        """
+        :return:
+            An integer of the number of bytes buffered that are not yet part of
+            a complete value
+        """
+
+        return len(self._buffer)
+
+    def feed(self, data):
+        """
+        Adds a chunk of data to the parser
+
+        :param data:
+            A byte string of the next chunk of BER/DER-encoded data
+
+        :raises:
+            ValueError - when the data is not valid BER, or a value exceeds max_size
+            TypeError - when data is not a byte string
+
+        :return:
+            A list of 6-element tuples for each top-level value completed by
+            this chunk, in the same format as returned by parse()
+        """
+
+        if not isinstance(data, byte_like_types) and not isinstance(data, bytearray):
+            raise TypeError('data must be a byte string, not %s' % type_name(data))
+
+        self._buffer.extend(data)
+
+        output = []
+        while self._scan():
+            end = self._end
+            encoded = bytes(self._buffer[:end])
+            del self._buffer[:end]
+            self._reset()
+            info, _ = _parse(encoded, end)
+            output.append(info)
+        return output
+
+    def _scan(self):
+        """
+        Examines headers of the current value until either its end is known or
+        more data is required
+
+        :raises:
+            ValueError - when the data is not valid BER, or the value exceeds max_size
+
+        :return:
+            A boolean - if the buffer contains a complete value
+        """
+
+        buffer = self._buffer
+        data_len = len(buffer)
+
+        while self._end is None:
+            pointer = self._pointer
+
+            if self._open:
+                if data_len < pointer + 2:
+                    break
+                if buffer[pointer] == 0 and buffer[pointer + 1] == 0:
+                    self._pointer = pointer + 2
+                    self._open -= 1
+                    if not self._open:
+                        self._end = self._pointer
+                    continue
+                if self._open > _MAX_DEPTH:
+                    raise ValueError('Indefinite-length recursion limit exceeded')
+
+            header = _parse_header(buffer, data_len, pointer)
+            if header is None:
+                break
+            contents_start, length = header[3:5]
+            if length is None:
+                self._open += 1
+                self._pointer = contents_start
+            elif self._open:
+                self._pointer = contents_start + length
+            else:
+                self._end = contents_start + length
+
+        if self._max_size is not None:
+            size = self._end if self._end is not None else max(self._pointer, data_len)
+            if size > self._max_size:
+                raise ValueError('Value exceeds the maximum size of %d bytes' % self._max_size)
+
+        return self._end is not None and data_len >= self._end
+
+    def _bytes_needed(self):
+        """
+        :return:
+            An integer of the minimum number of additional bytes required
+            before .feed() can return another value
+        """
+
+        data_len = len(self._buffer)
+        if self._end is not None:
+            return max(self._end - data_len, 1)
+        # Both a header and an end-of-contents marker are at least two bytes
+        return max(self._pointer + 2 - data_len, 1)
+
+
 def _parse(encoded_data, data_len, pointer=0, lengths_only=False, depth=0):
     """
     Parses a byte string into component parts
 
     :param encoded_data:
-        A byte string that contains BER-encoded data
+        A byte string that contains BER-encoded data. A memoryview may also be
+        used, in which case all returned byte values are slices of it.
 
     :param data_len:
         The integer length of the encoded data
@@ -243,6 +574,82 @@ def _parse(encoded_data, data_len, pointer=0, lengths_only=False, depth=0):
     )
 
 
+def _parse_header(encoded_data, data_len, pointer):
+    """
+    Parses the identifier and length octets of a value, without requiring the
+    contents to be present
+
+    :param encoded_data:
+        A byte string or bytearray that contains BER-encoded data
+
+    :param data_len:
+        The integer length of the encoded data
+
+    :param pointer:
+        The index in the byte string to parse from
+
+    :raises:
+        ValueError - when the header is not valid BER
+
+    :return:
+        None if the data ends before the header does, otherwise a 5-element
+        tuple:
+         - 0: integer class (0 to 3)
+         - 1: integer method
+         - 2: integer tag
+         - 3: integer index of the start of the contents
+         - 4: integer length of the contents, or None for indefinite-length
+    """
+
+    as_ord = _PY2 and not isinstance(encoded_data, bytearray)
+
+    if data_len < pointer + 1:
+        return None
+    first_octet = ord(encoded_data[pointer]) if as_ord else encoded_data[pointer]
+    pointer += 1
+
+    tag = first_octet & 31
+    constructed = (first_octet >> 5) & 1
+    if tag == 31:
+        tag = 0
+        while True:
+            if data_len < pointer + 1:
+                return None
+            num = ord(encoded_data[pointer]) if as_ord else encoded_data[pointer]
+            pointer += 1
+            if num == 0x80 and tag == 0:
+                raise ValueError('Non-minimal tag encoding')
+            tag *= 128
+            tag += num & 127
+            if num >> 7 == 0:
+                break
+        if tag < 31:
+            raise ValueError('Non-minimal tag encoding')
+
+    if data_len < pointer + 1:
+        return None
+    length_octet = ord(encoded_data[pointer]) if as_ord else encoded_data[pointer]
+    pointer += 1
+
+    if length_octet >> 7 == 0:
+        length = length_octet & 127
+
+    else:
+        length_octets = length_octet & 127
+        if length_octets:
+            if data_len < pointer + length_octets:
+                return None
+            pointer += length_octets
+            length = int_from_bytes(bytes(encoded_data[pointer - length_octets:pointer]), signed=False)
+
+        else:
+            if not constructed:
+                raise ValueError('Indefinite-length element must be constructed')
+            length = None
+
+    return (first_octet >> 6, constructed, tag, pointer, length)
+
+
 def _dump_header(class_, method, tag, contents):
     """
     Constructs the header bytes for an ASN.1 object
@@ -258,7 +665,8 @@ def _dump_header(class_, method, tag, contents):
         An integer ASN.1 tag value
 
     :param contents:
-        A byte string of the encoded byte contents
+        A byte string of the encoded byte contents, or an integer of the
+        length of the contents
 
     :return:
         A byte string of the ASN.1 DER header
@@ -281,7 +689,10 @@ def _dump_header(class_, method, tag, contents):
     else:
         header += chr_cls(id_num | tag)
 
-    length = len(contents)
+    if isinstance(contents, int_types):
+        length = contents
+    else:
+        length = len(contents)
     if length <= 127:
         header += chr_cls(length)
     else:
@@ -290,3 +701,36 @@ def _dump_header(class_, method, tag, contents):
         header += length_bytes
 
     return header
+
+
+def _load_speedups():
+    """
+    Replaces _parse() and _dump_header() with the implementations from the
+    optional asn1crypto._speedups C extension, if it has been compiled. The
+    pure-Python versions remain available as _py_parse() and
+    _py_dump_header(). Setting the environment variable
+    ASN1CRYPTO_NO_SPEEDUPS disables the extension.
+
+    :return:
+        The asn1crypto._speedups module, or None if not used
+    """
+
+    global _parse, _dump_header
+
+    if os.environ.get('ASN1CRYPTO_NO_SPEEDUPS'):
+        return None
+
+    try:
+        from . import _speedups
+    except ImportError:
+        return None
+
+    _speedups._set_fallbacks(_py_parse, _py_dump_header)
+    _parse = _speedups._parse
+    _dump_header = _speedups._dump_header
+    return _speedups
+
+
+_py_parse = _parse
+_py_dump_header = _dump_header
+_speedups = _load_speedups()
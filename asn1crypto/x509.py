@@ -9,6 +9,7 @@ ASN.1 type classes for X.509 certificates. Exports the following items:
  - GeneralName()
  - GeneralNames()
  - Name()
+ - filter_valid()
 
 Other type classes are defined that help compose the types listed above.
 """
@@ -16,6 +17,7 @@ Other type classes are defined that help compose the types listed above.
 from __future__ import unicode_literals, division, absolute_import, print_function
 
 from contextlib import contextmanager
+from datetime import datetime
 from encodings import idna  # noqa
 import hashlib
 import re
@@ -24,6 +26,7 @@ import stringprep
 import sys
 import unicodedata
 
+from ._cache import BoundedCache
 from ._errors import unwrap
 from ._iri import iri_to_uri, uri_to_iri
 from ._ordereddict import OrderedDict
@@ -37,6 +40,7 @@ from .core import (
     Choice,
     Concat,
     Enumerated,
+    FieldPath,
     GeneralizedTime,
     GeneralString,
     IA5String,
@@ -60,7 +64,11 @@ from .core import (
     VOID,
 )
 from .keys import PublicKeyInfo
-from .util import int_to_bytes, int_from_bytes, inet_ntop, inet_pton
+from .parser import _parse
+from .util import int_to_bytes, int_from_bytes, inet_ntop, inet_pton, timezone
+
+# Matches strings that _ldap_string_prep() can prepare by only lowercasing
+_PRINTABLE_ASCII_RE = re.compile(r'[\x20-\x7e]*\Z')
 
 
 # The structures in this file are taken from https://tools.ietf.org/html/rfc5280
@@ -697,6 +705,49 @@ class NameTypeAndValue(Sequence):
 
     _prepped = None
 
+    # A _cache.BoundedCache of unicode strings to the result of
+    # _ldap_string_prep(), or None when the cache is disabled - see
+    # enable_cache()
+    _prep_cache = None
+
+    @classmethod
+    def enable_cache(cls, max_size=4096):
+        """
+        Enables a cache of the results of the LDAP string preparation used
+        when comparing and hashing names. Attribute values such as country
+        codes and organization names repeat across many certificates, so
+        each distinct value is only prepared once.
+
+        :param max_size:
+            An integer of the maximum number of values to cache - once full,
+            the least recently used entry is removed for each new value
+
+        :raises:
+            ValueError - when max_size is less than 1
+        """
+
+        NameTypeAndValue._prep_cache = BoundedCache(max_size)
+
+    @classmethod
+    def disable_cache(cls):
+        """
+        Disables and clears the cache enabled by enable_cache()
+        """
+
+        NameTypeAndValue._prep_cache = None
+
+    @classmethod
+    def cache_info(cls):
+        """
+        :return:
+            None if the cache is disabled, otherwise a dict with the integer
+            keys "hits", "misses", "size" and "max_size"
+        """
+
+        if NameTypeAndValue._prep_cache is None:
+            return None
+        return NameTypeAndValue._prep_cache.info()
+
     @property
     def prepped_value(self):
         """
@@ -751,6 +802,41 @@ class NameTypeAndValue(Sequence):
             A prepared unicode string, ready for comparison
         """
 
+        cache = NameTypeAndValue._prep_cache
+        if cache is not None:
+            prepped = cache.get(string)
+            if prepped is not None:
+                return prepped
+
+        # Printable ASCII is not changed by the map, normalize, prohibit or
+        # bidirectional steps, other than the case folding of table B.2
+        if _PRINTABLE_ASCII_RE.match(string):
+            prepped = string.lower()
+        else:
+            prepped = self._ldap_string_prep_steps(string)
+
+        # Insignificant space handling step
+        prepped = ' ' + re.sub(' +', '  ', prepped).strip() + ' '
+
+        if cache is not None:
+            cache.set(string, prepped)
+        return prepped
+
+    def _ldap_string_prep_steps(self, string):
+        """
+        Performs the map, normalize, prohibit and check bidi steps of the
+        string preparation algorithm from RFC 4518
+
+        :param string:
+            A unicode string to prepare
+
+        :raises:
+            ValueError - when the string contains prohibited characters
+
+        :return:
+            A unicode string, before insignificant space handling
+        """
+
         # Map step
         string = re.sub('[\u00ad\u1806\u034f\u180b-\u180d\ufe0f-\uff00\ufffc]+', '', string)
         string = re.sub('[\u0009\u000a\u000b\u000c\u000d\u0085]', ' ', string)
@@ -842,9 +928,6 @@ class NameTypeAndValue(Sequence):
                     '''
                 ))
 
-        # Insignificant space handling step
-        string = ' ' + re.sub(' +', '  ', string).strip() + ' '
-
         return string
 
 
@@ -983,6 +1066,8 @@ class Name(Choice):
     _human_friendly = None
     _sha1 = None
     _sha256 = None
+    _hashable = None
+    _canonical_key = None
 
     @classmethod
     def build(cls, name_dict, use_printable=False):
@@ -1064,7 +1149,23 @@ class Name(Choice):
             A unicode string that can be used as a dict key or in a set
         """
 
-        return self.chosen.hashable
+        if self._hashable is None:
+            self._hashable = self.chosen.hashable
+        return self._hashable
+
+    @property
+    def canonical_key(self):
+        """
+        :return:
+            A byte string of the SHA-256 hash of the UTF-8 encoded .hashable
+            value. Names that are equal per RFC 5280 section 7.1 have the same
+            key, regardless of their string types, case or whitespace, making
+            it a compact dict key for issuer and subject lookups.
+        """
+
+        if self._canonical_key is None:
+            self._canonical_key = hashlib.sha256(self.hashable.encode('utf-8')).digest()
+        return self._canonical_key
 
     def __len__(self):
         return len(self.chosen)
@@ -2573,6 +2674,28 @@ class Certificate(Sequence):
 
         return self['tbs_certificate']['issuer']
 
+    @property
+    def subject_key_hash(self):
+        """
+        :return:
+            A byte string of the canonical key of the subject Name, which
+            equals the issuer_key_hash of the certificates it issued - see
+            Name.canonical_key
+        """
+
+        return self.subject.canonical_key
+
+    @property
+    def issuer_key_hash(self):
+        """
+        :return:
+            A byte string of the canonical key of the issuer Name, which
+            equals the subject_key_hash of the issuing certificate - see
+            Name.canonical_key
+        """
+
+        return self.issuer.canonical_key
+
     @property
     def serial_number(self):
         """
@@ -2819,7 +2942,17 @@ class Certificate(Sequence):
         """
 
         if self._self_issued is None:
-            self._self_issued = self.subject == self.issuer
+            subject = self.subject
+            issuer = self.issuer
+            if subject.dump() == issuer.dump():
+                self._self_issued = True
+            # Equal names always have the same canonical key, so when both
+            # were already computed, differing keys avoid the full comparison
+            elif subject._canonical_key is not None and issuer._canonical_key is not None \
+                    and subject._canonical_key != issuer._canonical_key:
+                self._self_issued = False
+            else:
+                self._self_issued = subject == issuer
         return self._self_issued
 
     @property
@@ -3052,3 +3185,107 @@ class CertificateAux(Sequence):
 
 class TrustedCertificate(Concat):
     _child_specs = [Certificate, CertificateAux]
+
+
+# A core.FieldPath to the validity of a Certificate, compiled on first use
+# by filter_valid()
+_VALIDITY_PATH = None
+
+
+def filter_valid(ders, at=None):
+    """
+    Checks if each of a list of DER-encoded certificates is within its
+    validity period, without constructing Certificate objects. The validity
+    is located by parsing only the headers of the preceding fields, and
+    times in the DER forms YYMMDDHHMMSSZ and YYYYMMDDHHMMSSZ are compared
+    as byte strings. Other time formats are fully parsed.
+
+    :param ders:
+        An iterable of byte strings of DER-encoded certificates
+
+    :param at:
+        A timezone-aware datetime.datetime object of the time to check. If
+        None, the current time is used.
+
+    :raises:
+        ValueError - when at is not timezone aware, or a certificate is not valid DER
+        TypeError - when a certificate is not a byte string
+
+    :return:
+        A list of booleans in the same order as ders - True when the
+        not_before time is at or before at, and at is at or before the
+        not_after time
+    """
+
+    global _VALIDITY_PATH
+
+    if at is None:
+        at = datetime.now(timezone.utc)
+    elif at.tzinfo is None:
+        raise ValueError('at must be timezone aware')
+
+    if _VALIDITY_PATH is None:
+        _VALIDITY_PATH = FieldPath(Certificate, 'tbs_certificate.validity')
+
+    utc = at.astimezone(timezone.utc)
+    at_key = ('%04d%02d%02d%02d%02d%02d' % (
+        utc.year, utc.month, utc.day, utc.hour, utc.minute, utc.second
+    )).encode('ascii')
+    # The keys have no fraction of a second, so an at key equal to the
+    # not_after key is only in range if at is on the whole second
+    at_fraction = at.microsecond != 0
+
+    output = []
+    for der in ders:
+        validity = _VALIDITY_PATH.extract(der, raw=True)
+        contents = _parse(validity, len(validity))[0][4]
+        not_before, pointer = _parse(contents, len(contents))
+        not_after, _ = _parse(contents, len(contents), pointer=pointer)
+
+        before_key = _time_key(not_before)
+        after_key = _time_key(not_after)
+        if before_key is not None and after_key is not None:
+            valid = before_key <= at_key and (at_key < after_key or (at_key == after_key and not at_fraction))
+        else:
+            valid = _time_native(not_before) <= at <= _time_native(not_after)
+        output.append(valid)
+
+    return output
+
+
+def _time_key(parts):
+    """
+    Converts an encoded UTCTime or GeneralizedTime in the common DER form to
+    a byte string that sorts in time order
+
+    :param parts:
+        A 6-element tuple of the parsed time from asn1crypto.parser._parse()
+
+    :return:
+        A 14-byte byte string of YYYYMMDDHHMMSS, or None if the time is not
+        in the form YYMMDDHHMMSSZ or YYYYMMDDHHMMSSZ
+    """
+
+    class_, _, tag, _, contents, _ = parts
+    if class_ != 0:
+        return None
+    if tag == 23 and len(contents) == 13 and contents[12:] == b'Z' and contents[:12].isdigit():
+        # UTCTime years 50 to 99 are 1950 to 1999, and 00 to 49 are 2000 to 2049
+        return (b'19' if contents[:2] >= b'50' else b'20') + contents[:12]
+    if tag == 24 and len(contents) == 15 and contents[14:] == b'Z' and contents[:14].isdigit():
+        return contents[:14]
+    return None
+
+
+def _time_native(parts):
+    """
+    Fully parses an encoded UTCTime or GeneralizedTime
+
+    :param parts:
+        A 6-element tuple of the parsed time from asn1crypto.parser._parse()
+
+    :return:
+        A datetime.datetime or asn1crypto.util.extended_datetime object
+    """
+
+    return Time.load(b''.join(parts[3:6])).native
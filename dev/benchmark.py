@@ -0,0 +1,226 @@
+# coding: utf-8
+from __future__ import unicode_literals, division, absolute_import, print_function
+
+import gc
+import os
+import sys
+import timeit
+
+from . import package_root
+from ._import import _import_from
+
+if sys.version_info < (3,):
+    range = xrange  # noqa
+
+
+run_args = [
+    {
+        'name': 'benchmark',
+        'kwarg': 'name',
+    },
+]
+
+
+fixtures_dir = os.path.join(package_root, 'tests', 'fixtures')
+
+
+def _load_fixture(*path):
+    """
+    :return:
+        A byte string of the contents of the fixture
+    """
+
+    with open(os.path.join(fixtures_dir, *path), 'rb') as f:
+        return f.read()
+
+
+def _touch(value):
+    """
+    Accesses every child of a parsed value so that all of the lazily-parsed
+    objects are created
+
+    :param value:
+        An asn1crypto.core.Asn1Value object
+    """
+
+    core = _import_from('asn1crypto.core', package_root)
+
+    if isinstance(value, (core.Sequence, core.SequenceOf)):
+        for index in range(len(value)):
+            _touch(value[index])
+    elif isinstance(value, core.Choice):
+        _touch(value.chosen)
+
+
+def _memory(count=500):
+    """
+    Measures the memory retained by fully-parsed Certificate objects
+
+    :param count:
+        An integer of the number of certificates to load
+
+    :return:
+        A unicode string describing the result
+    """
+
+    try:
+        import tracemalloc
+    except (ImportError):
+        return 'skipped, tracemalloc is not available'
+
+    x509 = _import_from('asn1crypto.x509', package_root)
+    der = _load_fixture('keys', 'test-der.crt')
+
+    # Warm up the class setup so it is not included in the measurement
+    _touch(x509.Certificate.load(der))
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        certs = []
+        for _ in range(count):
+            cert = x509.Certificate.load(der)
+            _touch(cert)
+            certs.append(cert)
+        gc.collect()
+        used = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+
+    return '%d bytes per Certificate' % (used // count)
+
+
+def _parse(number=2000):
+    """
+    Measures the time to fully parse the TbsCertificate of a Certificate
+
+    :param number:
+        An integer of the number of certificates to parse per repetition
+
+    :return:
+        A unicode string describing the result
+    """
+
+    x509 = _import_from('asn1crypto.x509', package_root)
+    der = _load_fixture('keys', 'test-der.crt')
+
+    def parse():
+        cert = x509.Certificate.load(der)
+        cert['tbs_certificate']._parse_children(recurse=True)
+
+    best = min(timeit.repeat(parse, number=number, repeat=5))
+    return '%.1f usec per Certificate' % (best / number * 1000000)
+
+
+def _set(number=20000):
+    """
+    Measures the time to parse and re-encode the Set types from x509
+
+    :param number:
+        An integer of the number of values to parse per repetition
+
+    :return:
+        A unicode string describing the result
+    """
+
+    x509 = _import_from('asn1crypto.x509', package_root)
+
+    values = [
+        x509.PersonalName({
+            'surname': 'Smith',
+            'given_name': 'John',
+            'initials': 'J',
+            'generation_qualifier': 'Jr',
+        }),
+        x509.TeletexPersonalName({'surname': 'Smith', 'given_name': 'John'}),
+        x509.PDSParameter({'printable_string': 'Street', 'teletex_string': 'Street'}),
+        x509.UnformattedPostalAddress({'teletex_string': 'Street'}),
+    ]
+    encodings = [(value.__class__, value.dump()) for value in values]
+
+    def parse():
+        for spec, der in encodings:
+            value = spec.load(der)
+            value.native
+            value.dump(force=True)
+
+    best = min(timeit.repeat(parse, number=number // len(encodings), repeat=5))
+    return '%.1f usec per Set' % (best / number * 1000000)
+
+
+def _time(number=3):
+    """
+    Measures the time to read the revocation dates of a CRL, with and
+    without the time cache. About a third of the dates in the CRL repeat an
+    earlier one, and reading the CRL again, as a service checking revocation
+    would, repeats all of them. The cache is sized to hold every distinct
+    date, since a smaller cache is emptied by each pass over the CRL.
+
+    :param number:
+        An integer of the number of times to read the CRL per repetition
+
+    :return:
+        A unicode string describing the result
+    """
+
+    core = _import_from('asn1crypto.core', package_root)
+    crl = _import_from('asn1crypto.crl', package_root)
+    der = _load_fixture('eid2011.crl')
+
+    entries = crl.CertificateList.load(der)['tbs_cert_list']['revoked_certificates']
+    revoked = [entry['revocation_date'].chosen for entry in entries]
+    encodings = [(value.__class__, value.contents) for value in revoked]
+    cache_size = len(set(encodings))
+
+    def read():
+        for spec, contents in encodings:
+            spec(contents=contents).native
+
+    def first_read():
+        core.AbstractTime.enable_cache(max_size=cache_size)
+        read()
+
+    results = []
+    try:
+        results.append(min(timeit.repeat(read, number=number, repeat=5)) / number)
+        results.append(min(timeit.repeat(first_read, number=1, repeat=5)))
+        core.AbstractTime.enable_cache(max_size=cache_size)
+        results.append(min(timeit.repeat(read, number=number, repeat=5)) / number)
+    finally:
+        core.AbstractTime.disable_cache()
+
+    return (
+        '%.2f usec per revocation date, %.2f usec with the cache on the first read and %.2f usec once it is filled'
+        % tuple([result / len(encodings) * 1000000 for result in results])
+    )
+
+
+_BENCHMARKS = [
+    ('memory', _memory),
+    ('parse', _parse),
+    ('set', _set),
+    ('time', _time),
+]
+
+
+def run(name=None):
+    """
+    Runs the benchmarks, printing the results
+
+    :param name:
+        A unicode string of the name of a single benchmark to run. A value of
+        None will cause all benchmarks to be run.
+
+    :return:
+        A bool - if the benchmarks were run
+    """
+
+    benchmarks = [b for b in _BENCHMARKS if name is None or b[0] == name]
+    if not benchmarks:
+        print('Unknown benchmark %s, valid options: %s' % (name, ', '.join(b[0] for b in _BENCHMARKS)))
+        return False
+
+    print('Python %s' % sys.version.split(' ')[0])
+    for benchmark_name, benchmark in benchmarks:
+        print('%s: %s' % (benchmark_name, benchmark()))
+    return True
@@ -1,11 +1,13 @@
 import codecs
 import os
+import platform
 import shutil
 import sys
 import warnings
 
 import setuptools
-from setuptools import setup, Command
+from setuptools import setup, Command, Extension
+from setuptools.command.build_ext import build_ext
 from setuptools.command.egg_info import egg_info
 
 
@@ -46,9 +48,37 @@ if sys.argv[1:] == ['sdist'] or sorted(sys.argv[1:]) == ['-q', 'sdist']:
         '../LICENSE',
         '../*.md',
         '../docs/*.md',
+        '_speedups.c',
     ]
 
 
+# The C implementation of the parser internals is optional and only compiled
+# when requested via the ASN1CRYPTO_SPEEDUPS env var, so the default build
+# remains a pure-Python universal wheel
+ext_modules = []
+if os.environ.get('ASN1CRYPTO_SPEEDUPS') and platform.python_implementation() == 'CPython':
+    ext_modules.append(Extension(
+        '%s._speedups' % PACKAGE_NAME,
+        [os.path.join(PACKAGE_NAME, '_speedups.c')]
+    ))
+
+
+# Allows the install to continue using the pure-Python parser if the optional
+# C extension fails to compile, e.g. due to a missing compiler
+class BuildExtCommand(build_ext):
+    def run(self):
+        try:
+            build_ext.run(self)
+        except Exception as e:
+            warnings.warn('Unable to build optional C extension: %s' % e)
+
+    def build_extension(self, ext):
+        try:
+            build_ext.build_extension(self, ext)
+        except Exception as e:
+            warnings.warn('Unable to build optional C extension %s: %s' % (ext.name, e))
+
+
 # Ensures a copy of the LICENSE is included with the egg-info for
 # install and bdist_egg commands
 class EggInfoCommand(egg_info):
@@ -153,11 +183,13 @@ setup(
 
     packages=[PACKAGE_NAME],
     package_data=package_data,
+    ext_modules=ext_modules,
 
     tests_require=tests_require,
     test_suite=test_suite,
 
     cmdclass={
+        'build_ext': BuildExtCommand,
         'clean': CleanCommand,
         'egg_info': EggInfoCommand,
     }
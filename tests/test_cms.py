@@ -645,6 +645,28 @@ class CMSTests(unittest.TestCase):
             signed_data = info['content']
             self.assertIsInstance(signed_data.native, util.OrderedDict)
 
+    def test_dump_spliced_mutation(self):
+        with open(os.path.join(fixtures_dir, 'cms-signed.der'), 'rb') as f:
+            der = f.read()
+
+        info = cms.ContentInfo.load(der)
+        signed_data = info['content']
+        signed_data['certificates'][0].chosen.native
+        signer_info = signed_data['signer_infos'][0]
+        signer_info['signature'] = b'\x01' * 300
+        mutated = info.dump()
+
+        expected = cms.ContentInfo.load(der)
+        expected['content']['signer_infos'][0]['signature'] = b'\x01' * 300
+        self.assertEqual(expected.dump(force=True), mutated)
+        self.assertEqual(b'\x01' * 300, cms.ContentInfo.load(mutated)['content']['signer_infos'][0]['signature'].native)
+
+        # The mutated descendants reference the new encoding
+        if sys.version_info >= (3,):
+            self.assertIsInstance(signed_data._contents, memoryview)
+        self.assertTrue(mutated.endswith(signed_data.dump()))
+        self.assertEqual(expected['content'].native, signed_data.native)
+
     def test_parse_content_info_cms_signed_digested_data(self):
         with open(os.path.join(fixtures_dir, 'cms-signed-digested.der'), 'rb') as f:
             info = cms.ContentInfo.load(f.read())
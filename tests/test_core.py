@@ -2,9 +2,11 @@
 from __future__ import unicode_literals, division, absolute_import, print_function
 
 import pickle
+import sys
 import unittest
 import os
 from datetime import datetime, timedelta
+from io import BytesIO
 
 from asn1crypto import core, util
 
@@ -33,6 +35,10 @@ class SequenceOfInts(core.SequenceOf):
     _child_spec = core.Integer
 
 
+class ExplicitSequenceOfInts(SequenceOfInts):
+    explicit = (2, 2)
+
+
 class SequenceAny(core.SequenceOf):
     _child_spec = core.Any
 
@@ -164,6 +170,14 @@ class SetTestOldApi(core.Set):
     ]
 
 
+class SetWithChoice(core.Set):
+    _fields = [
+        ('num', NumChoice),
+        ('value', core.Integer, {'default': 1}),
+        ('name', core.UTF8String, {'optional': True}),
+    ]
+
+
 class SetOfTest(core.SetOf):
     _child_spec = core.Integer
 
@@ -187,6 +201,84 @@ class SequenceWithDefault(core.Sequence):
     ]
 
 
+class OptionalChoiceSequence(core.Sequence):
+    _fields = [
+        ('choice', NumChoice, {'optional': True}),
+        ('explicit_choice', NumChoice, {'explicit': 3, 'optional': True}),
+        ('value', core.Integer),
+    ]
+
+
+class SplicedInner(core.Sequence):
+    _fields = [
+        ('x', core.Integer),
+        ('y', core.Integer),
+    ]
+
+
+class SplicedRequired(core.Sequence):
+    _fields = [
+        ('z', core.Integer),
+    ]
+
+
+class SplicedOuter(core.Sequence):
+    _fields = [
+        ('a', SplicedInner),
+        ('b', SplicedRequired),
+    ]
+
+
+class WalkHookRequired(SplicedRequired):
+    # A function called the next time the value is checked for mutations
+    _on_walk = None
+
+    def _is_mutated(self):
+        if self._on_walk is not None:
+            on_walk = self._on_walk
+            self._on_walk = None
+            on_walk()
+        return super(WalkHookRequired, self)._is_mutated()
+
+
+class SetOfSeq(core.SetOf):
+    _child_spec = Seq
+
+
+class SetOfSeqChoice(core.SetOf):
+    _child_spec = SeqChoice
+
+
+class CountingInteger(core.Integer):
+    _dump_calls = 0
+
+    def dump(self, force=False):
+        self.__class__._dump_calls += 1
+        return super(CountingInteger, self).dump(force=force)
+
+
+class SetOfCountingInts(core.SetOf):
+    _child_spec = CountingInteger
+
+
+class CountingSeq(Seq):
+    _dump_calls = 0
+
+    def dump(self, force=False):
+        self.__class__._dump_calls += 1
+        return super(CountingSeq, self).dump(force=force)
+
+
+class CountingSeqChoice(core.Choice):
+    _alternatives = [
+        ('seq', CountingSeq, {'explicit': 0}),
+    ]
+
+
+class SetOfCountingSeqChoice(core.SetOf):
+    _child_spec = CountingSeqChoice
+
+
 class ConcatTest(core.Concat):
     _child_specs = [Seq, core.Integer]
 
@@ -438,6 +530,36 @@ class CoreTests(unittest.TestCase):
         self.assertEqual(a.contents, b.contents)
         self.assertEqual(a.dump(), b.dump())
 
+    def test_time_fast_path(self):
+        for cls, contents in ((core.UTCTime, b'491231083000Z'), (core.GeneralizedTime, b'20491231083000Z')):
+            value = cls(contents=contents)
+            self.assertIsNotNone(value._fast_datetime(contents))
+            parsed = value._parsed_time
+            del parsed['fraction']
+            self.assertEqual(value._get_datetime(parsed), value.native)
+
+        self.assertIsNone(core.UTCTime()._fast_datetime(b'4912310830Z'))
+        self.assertIsNone(core.GeneralizedTime()._fast_datetime(b'20491231083000.5Z'))
+        self.assertIsNone(core.GeneralizedTime()._fast_datetime(b'00001231083000Z'))
+        with self.assertRaises(ValueError):
+            core.UTCTime(contents=b'491331083000Z').native
+
+    def test_time_cache(self):
+        self.assertIsNone(core.AbstractTime.cache_info())
+        core.UTCTime.enable_cache()
+        try:
+            first = core.UTCTime.load(b'\x17\x0D201201120000Z').native
+            self.assertEqual(datetime(2020, 12, 1, 12, 0, tzinfo=util.timezone.utc), first)
+            self.assertIs(first, core.UTCTime.load(b'\x17\x0D201201120000Z').native)
+            # The same contents mean a different time for GeneralizedTime
+            generalized = core.GeneralizedTime(contents=b'201201120000Z').native
+            self.assertEqual(datetime(2012, 1, 12, 0, 0, tzinfo=util.timezone.utc), generalized)
+            self.assertIs(generalized, core.GeneralizedTime(contents=b'201201120000Z').native)
+            self.assertEqual({'hits': 2, 'misses': 2, 'size': 2, 'max_size': 4096}, core.AbstractTime.cache_info())
+        finally:
+            core.GeneralizedTime.disable_cache()
+        self.assertIsNone(core.UTCTime.cache_info())
+
     @staticmethod
     def generalized_time_info():
         def tz(hours, minutes=0):
@@ -714,6 +836,27 @@ class CoreTests(unittest.TestCase):
         with self.assertRaises(ValueError):
             seq.append(5)
 
+    def test_sequence_optional_choice(self):
+        seq = OptionalChoiceSequence.load(b'\x30\x03\x02\x01\x09')
+        self.assertEqual({'choice': None, 'explicit_choice': None, 'value': 9}, seq.native)
+
+        seq = OptionalChoiceSequence.load(b'\x30\x06\x81\x01\x05\x02\x01\x09')
+        self.assertEqual('two', seq['choice'].name)
+        self.assertEqual({'choice': 5, 'explicit_choice': None, 'value': 9}, seq.native)
+
+        seq = OptionalChoiceSequence.load(b'\x30\x0a\xa3\x05\xa0\x03\x02\x01\x07\x02\x01\x09')
+        self.assertEqual('one', seq['explicit_choice'].name)
+        self.assertEqual({'choice': None, 'explicit_choice': 7, 'value': 9}, seq.native)
+
+        # The alternatives of the untagged choice are expanded ahead of time,
+        # whereas the explicitly-tagged choice is validated when parsing
+        matchers = OptionalChoiceSequence._field_matchers
+        self.assertTrue((2, 0) in matchers[0])
+        self.assertTrue((2, 1) in matchers[0])
+        self.assertTrue((2, 3) not in matchers[0])
+        self.assertEqual(False, matchers[1])
+        self.assertEqual(None, matchers[2])
+
     def test_copy(self):
         a = core.Integer(200)
         b = a.copy()
@@ -994,10 +1137,147 @@ class CoreTests(unittest.TestCase):
         self.assertEqual('abc', MyOids('abc').native)
         self.assertEqual('1.2.3', MyOids('abc').dotted)
 
+    def test_oid_cache(self):
+        self.assertIsNone(core.ObjectIdentifier.cache_info())
+        MyOids.enable_cache(max_size=1, seed=False)
+        try:
+            first = core.ObjectIdentifier.load(b'\x06\x02\x2a\x03')
+            second = MyOids.load(b'\x06\x02\x2a\x03')
+            self.assertEqual('1.2.3', first.dotted)
+            self.assertEqual('abc', second.native)
+            self.assertIs(first.dotted, second.dotted)
+            self.assertEqual({'hits': 1, 'misses': 1, 'size': 1, 'max_size': 1}, core.ObjectIdentifier.cache_info())
+
+            # Once full, the oldest entry is replaced
+            self.assertEqual('2.5.4.3', core.ObjectIdentifier.load(b'\x06\x03\x55\x04\x03').dotted)
+            self.assertEqual('1.2.3', core.ObjectIdentifier.load(b'\x06\x02\x2a\x03').dotted)
+            self.assertEqual({'hits': 1, 'misses': 3, 'size': 1, 'max_size': 1}, MyOids.cache_info())
+        finally:
+            core.ObjectIdentifier.disable_cache()
+        self.assertIsNone(MyOids.cache_info())
+
+        # Hits keep an entry from being the next one evicted
+        core.ObjectIdentifier.enable_cache(max_size=2, seed=False)
+        try:
+            for encoded in (b'\x06\x02\x2a\x03', b'\x06\x03\x55\x04\x03', b'\x06\x02\x2a\x03', b'\x06\x03\x55\x04\x06'):
+                core.ObjectIdentifier.load(encoded).dotted
+            self.assertEqual('1.2.3', core.ObjectIdentifier.load(b'\x06\x02\x2a\x03').dotted)
+            self.assertEqual({'hits': 2, 'misses': 3, 'size': 2, 'max_size': 2}, core.ObjectIdentifier.cache_info())
+        finally:
+            core.ObjectIdentifier.disable_cache()
+
+        with self.assertRaises(ValueError):
+            core.ObjectIdentifier.enable_cache(max_size=0)
+
+    def test_oid_cache_seeded(self):
+        core.ObjectIdentifier.enable_cache()
+        try:
+            self.assertEqual('1.2.3', core.ObjectIdentifier.load(b'\x06\x02\x2a\x03').dotted)
+            self.assertEqual(1, core.ObjectIdentifier.cache_info()['hits'])
+
+            self.assertEqual(b'\x06\x02\x2a\x03', MyOids('abc').dump())
+            self.assertEqual(b'\x06\x03\x81\x80\x50', core.ObjectIdentifier('2.16384').dump())
+            self.assertEqual(b'\x06\x03\x81\x80\x50', core.ObjectIdentifier('2.16384').dump())
+            info = core.ObjectIdentifier.cache_info()
+            self.assertEqual(3, info['hits'])
+            self.assertEqual(1, info['misses'])
+        finally:
+            core.ObjectIdentifier.disable_cache()
+
+    def test_oid_decode_many(self):
+        encoded = [b'\x2a\x03', b'\x88\x37\x03', b'\x2a\x03', b'']
+        self.assertEqual(['abc', '2.999.3', 'abc', ''], MyOids.decode_many(encoded))
+        self.assertEqual(['1.2.3', '2.999.3', '1.2.3', ''], core.ObjectIdentifier.decode_many(encoded))
+        for contents in encoded:
+            self.assertEqual(
+                core.ObjectIdentifier(contents=contents).dotted,
+                core.ObjectIdentifier.decode_many([contents])[0]
+            )
+
+    def test_dump_iter(self):
+        der = b'\x30\x0b\x06\x02\x2a\x03\x04\x05\x68\x65\x6c\x6c\x6f'
+        seq = Seq.load(der)
+        self.assertEqual(der, b''.join(seq.dump_iter()))
+
+        seq = CopySeq({'name': 'a', 'pair': {'id': '1.2.3', 'value': 5}})
+        seq.dump()
+        seq['pair']['value'] = 6
+        chunks = list(seq.dump_iter())
+        self.assertTrue(len(chunks) > 1)
+        self.assertEqual(b'\x30\x0c\x0c\x01\x61\x30\x07\x06\x02\x2a\x03\x02\x01\x06', b''.join(chunks))
+
+        # Iterating does not update the cached encoding
+        self.assertTrue(seq._is_mutated())
+        self.assertEqual(b''.join(chunks), seq.dump())
+
+    def test_dump_into(self):
+        seq = CopySeq({'name': 'a', 'pair': {'id': '1.2.3', 'value': 5}})
+        der = seq.dump()
+
+        buffer = bytearray(b'\xff\xff')
+        self.assertEqual(len(der), seq.dump_into(buffer, 2))
+        self.assertEqual(b'\xff\xff' + der, bytes(buffer))
+
+        buffer = bytearray(len(der) + 1)
+        view = memoryview(buffer)
+        self.assertEqual(len(der), seq.dump_into(view, 1))
+        self.assertEqual(b'\x00' + der, bytes(buffer))
+
+        with self.assertRaises(ValueError):
+            seq.dump_into(view, 2)
+
+    def test_sequence_of_writer(self):
+        output = BytesIO()
+        writer = core.SequenceOfWriter(SequenceOfInts, output, spool_size=64)
+        for value in range(1000):
+            writer.write(value)
+        writer.write(core.Integer(-1))
+        expected = SequenceOfInts(list(range(1000)) + [-1]).dump()
+        self.assertEqual(len(expected), writer.close())
+        self.assertEqual(1001, writer.count)
+        self.assertEqual(expected, output.getvalue())
+
+        with self.assertRaises(ValueError):
+            writer.write(1)
+
+        output = BytesIO()
+        with core.SequenceOfWriter(ExplicitSequenceOfInts, output) as writer:
+            writer.write(1)
+            writer.write(2)
+        self.assertEqual(b'\xa2\x08\x30\x06\x02\x01\x01\x02\x01\x02', output.getvalue())
+
+        output = BytesIO()
+        with self.assertRaises(ValueError):
+            with core.SequenceOfWriter(SequenceOfInts, output) as writer:
+                writer.write(1)
+                writer.write('a')
+        self.assertEqual(b'', output.getvalue())
+
+        with self.assertRaises(TypeError):
+            core.SequenceOfWriter(SetOfTest, output)
+
     def test_dump_set(self):
         st = SetTest({'two': 2, 'one': 1})
         self.assertEqual(b'1\x06\x81\x01\x01\x82\x01\x02', st.dump())
 
+    def test_dump_set_optional(self):
+        st = SetWithChoice({'num': NumChoice('two', 7)})
+        self.assertEqual(b'\x31\x03\x81\x01\x07', st.dump())
+
+    def test_parse_set_choice(self):
+        st = SetWithChoice.load(b'\x31\x06\x02\x01\x05\x81\x01\x07')
+        self.assertEqual('two', st['num'].name)
+        self.assertEqual({'num': 7, 'value': 5, 'name': None}, st.native)
+        self.assertEqual(b'\x31\x06\x02\x01\x05\x81\x01\x07', st.dump(force=True))
+
+        st = SetWithChoice.load(b'\x31\x05\xa0\x03\x02\x01\x07')
+        self.assertEqual('one', st['num'].name)
+        self.assertEqual({'num': 7, 'value': 1, 'name': None}, st.native)
+        self.assertEqual(b'\x31\x05\xa0\x03\x02\x01\x07', st.dump(force=True))
+
+        st = SetWithChoice({'num': NumChoice('one', 7), 'value': 5})
+        self.assertEqual(b'\x31\x08\x02\x01\x05\xa0\x03\x02\x01\x07', st.dump())
+
     def test_force_dump_unknown_sequence(self):
         seq = Seq({
             'id': '1.2.3',
@@ -1054,6 +1334,39 @@ class CoreTests(unittest.TestCase):
         self.assertFalse(inner._mutated)
         self.assertFalse(outer._mutated)
 
+    def test_unchanged_tree_is_not_walked_again(self):
+        value = RecursiveSequence.load(b'\x30\x00')
+        for _ in range(5):
+            value = RecursiveSequence({'child': value})
+        value.dump()
+
+        inner = value
+        while inner['child'] is not core.VOID:
+            inner = inner['child']
+        inner.children = None
+
+        # The walk would raise if it reached the innermost value now that its
+        # children are no longer a list
+        self.assertFalse(value._is_mutated())
+
+        inner.children = [core.VOID]
+        inner['child'] = RecursiveSequence.load(b'\x30\x00')
+        self.assertTrue(value._is_mutated())
+        self.assertEqual(b'\x30\x0c\x30\x0a\x30\x08\x30\x06\x30\x04\x30\x02\x30\x00', value.dump())
+
+    def test_mutation_during_walk_is_not_lost(self):
+        value = SplicedOuter({'a': {'x': 1, 'y': 2}, 'b': WalkHookRequired({'z': 3})})
+        value.dump()
+
+        def mutate():
+            value['a']['x'] = 4
+        value['b']._on_walk = mutate
+        # The walk checks the first field before the second one mutates it
+        core._note_mutation()
+        self.assertFalse(value._is_mutated())
+        self.assertTrue(value._is_mutated())
+        self.assertEqual(4, SplicedOuter.load(value.dump())['a']['x'].native)
+
     def test_mutation_after_dump_preserves_set_ordering(self):
         value = SetTest({'two': 2, 'one': 1})
         value.dump()
@@ -1067,6 +1380,100 @@ class CoreTests(unittest.TestCase):
         self.assertEqual(b'1\x09\x02\x01\x01\x02\x01\x02\x02\x01\x03', value.dump())
         self.assertFalse(value._mutated)
 
+    def test_set_of_reuses_sorted_encodings(self):
+        value = SetOfCountingInts([5, 3])
+        value.dump()
+        value.append(4)
+        value.append(1)
+        CountingInteger._dump_calls = 0
+        self.assertEqual(SetOfTest([1, 3, 4, 5]).dump(), value.dump())
+        self.assertEqual(2, CountingInteger._dump_calls)
+        self.assertEqual([b'\x02\x01\x05', b'\x02\x01\x03', b'\x02\x01\x04', b'\x02\x01\x01'], value._child_encodings)
+        if core._USE_SLOTS:
+            self.assertEqual({}, vars(value))
+
+        value = SetOfSeq([{'id': '1.2.3', 'value': 9}, {'id': '2.3.4', 'value': b'\x01'}])
+        value.dump()
+        value[0]['value'] = 1
+        value.append({'id': '1.2.3', 'value': 5})
+        expected = SetOfSeq([
+            {'id': '1.2.3', 'value': 1},
+            {'id': '2.3.4', 'value': b'\x01'},
+            {'id': '1.2.3', 'value': 5},
+        ])
+        self.assertEqual(expected.dump(), value.dump())
+
+        del value[0]
+        self.assertIsNone(value._child_encodings)
+        self.assertEqual(SetOfSeq(expected.native[1:]).dump(), value.dump())
+
+    def test_failed_dump_leaves_mutations_intact(self):
+        value = SplicedOuter.load(b'\x30\x0d\x30\x06\x02\x01\x01\x02\x01\x02\x30\x03\x02\x01\x05')
+        value['a']['y'] = 1000000
+        # The required field can not be cleared via the public API
+        required = value['b']
+        required['z'] = 4
+        required.children[0] = core.VOID
+        with self.assertRaises(ValueError):
+            value.dump()
+        self.assertTrue(value['a']._mutated)
+
+        value['b']['z'] = 3
+        self.assertEqual(b'\x30\x0f\x30\x08\x02\x01\x01\x02\x03\x0f\x42\x40\x30\x03\x02\x01\x03', value.dump())
+        self.assertEqual(value.dump(force=True), value.dump())
+
+    def test_set_of_detects_untracked_child_changes(self):
+        value = SetOfTest([5, 3])
+        value.dump()
+        value[1].set(7)
+        value.append(1)
+        self.assertEqual(SetOfTest([5, 7, 1]).dump(), value.dump())
+        self.assertEqual(value.dump(force=True), value.dump())
+
+        pair = {'id': '1.2.3', 'value': 2}
+        value = SetOfSeqChoice([
+            SeqChoice(name='one', value={'name': 'a', 'pair': pair}),
+            SeqChoice(name='one', value={'name': 'b', 'pair': pair}),
+        ])
+        value.dump()
+        value[0].chosen['name'] = 'c'
+        value.append(SeqChoice(name='one', value={'name': 'd', 'pair': pair}))
+        expected = SetOfSeqChoice([
+            SeqChoice(name='one', value={'name': name, 'pair': pair})
+            for name in ('b', 'c', 'd')
+        ])
+        self.assertEqual(expected.dump(), value.dump())
+        self.assertEqual(value.dump(force=True), value.dump())
+
+        # A child re-encoded on its own is no longer reported as mutated
+        value = SetOfSeq([{'id': '1.2.3', 'value': 1}, {'id': '1.2.3', 'value': 2}])
+        value.dump()
+        value[0]['value'] = 5
+        value[0].dump()
+        value.append({'id': '1.2.3', 'value': 3})
+        expected = SetOfSeq([{'id': '1.2.3', 'value': number} for number in (5, 2, 3)])
+        self.assertEqual(expected.dump(), value.dump())
+        self.assertEqual(value.dump(force=True), value.dump())
+
+    def test_set_of_choice_children_are_not_redumped(self):
+        value = SetOfCountingSeqChoice([
+            CountingSeqChoice(name='seq', value={'id': '1.2.3', 'value': number})
+            for number in (1, 2)
+        ])
+        value.dump()
+        value.append(CountingSeqChoice(name='seq', value={'id': '1.2.3', 'value': 3}))
+        CountingSeq._dump_calls = 0
+        value.dump()
+        self.assertEqual(1, CountingSeq._dump_calls)
+
+        value[0].chosen['value'] = 4
+        value.append(CountingSeqChoice(name='seq', value={'id': '1.2.3', 'value': 5}))
+        expected = SetOfCountingSeqChoice([
+            CountingSeqChoice(name='seq', value={'id': '1.2.3', 'value': number})
+            for number in (4, 2, 3, 5)
+        ])
+        self.assertEqual(expected.dump(), value.dump())
+
     def test_force_dump_clears_mutation_state(self):
         value = SequenceOfInts([1, 2])
         self.assertEqual(b'0\x06\x02\x01\x01\x02\x01\x02', value.dump(force=True))
@@ -1474,3 +1881,11 @@ class CoreTests(unittest.TestCase):
         self.assertIn(b"unpickle_helper", pickled_bytes)
         unpickled = pickle.loads(pickled_bytes)
         self.assertEqual(orig.native, unpickled.native)
+
+    @unittest.skipIf(sys.version_info < (3,), 'memoryview parsing is only done on Python 3')
+    def test_load_zero_copy_mutate(self):
+        value = SequenceOfInts.load(b'\x30\x06\x02\x01\x01\x02\x01\x02', zero_copy=True)
+        self.assertIsInstance(value._contents, memoryview)
+        value.append(3)
+        self.assertEqual(b'\x30\x09\x02\x01\x01\x02\x01\x02\x02\x01\x03', value.dump())
+        self.assertEqual([1, 2, 3], value.native)
@@ -5,7 +5,7 @@ import unittest
 import sys
 import os
 
-from asn1crypto import crl
+from asn1crypto import crl, x509
 
 from ._unittest_compat import patch
 
@@ -40,3 +40,63 @@ class CRLTests(unittest.TestCase):
                 serial_number,
                 num_cls
             )
+
+    def test_load_file(self):
+        path = os.path.join(fixtures_dir, 'eid2011.crl')
+        with open(path, 'rb') as f:
+            der = f.read()
+        expected = crl.CertificateList.load(der)
+
+        for mmap in (True, False):
+            cert_list = crl.CertificateList.load_file(path, mmap=mmap)
+            revoked = cert_list['tbs_cert_list']['revoked_certificates']
+            self.assertEqual(15752, len(revoked))
+            self.assertEqual(
+                expected['tbs_cert_list']['revoked_certificates'][-1].native,
+                revoked[-1].native
+            )
+            self.assertEqual(expected.signature, cert_list.signature)
+            self.assertEqual(der, cert_list.dump())
+
+    def test_iter_revoked(self):
+        with open(os.path.join(fixtures_dir, 'eid2011.crl'), 'rb') as f:
+            cert_list = crl.CertificateList.load(f.read())
+
+        count = 0
+        last = None
+        for revoked_cert in cert_list.iter_revoked():
+            self.assertIsInstance(revoked_cert, crl.RevokedCertificate)
+            count += 1
+            last = revoked_cert
+        self.assertEqual(15752, count)
+        self.assertIsNone(cert_list['tbs_cert_list']['revoked_certificates'].children)
+        self.assertEqual(
+            cert_list['tbs_cert_list']['revoked_certificates'][-1].native,
+            last.native
+        )
+        self.assertEqual(15752, len(list(cert_list.iter_revoked())))
+
+    def test_iter_revoked_empty(self):
+        cert_list = crl.CertificateList({
+            'tbs_cert_list': crl.TbsCertList({
+                'signature': {'algorithm': 'sha256_rsa'},
+                'issuer': x509.Name.build({'common_name': 'Example'}),
+                'this_update': {'utc_time': '170101000000Z'},
+            }),
+            'signature_algorithm': {'algorithm': 'sha256_rsa'},
+            'signature': b'',
+        })
+        self.assertEqual([], list(cert_list.iter_revoked()))
+
+    def test_serial_index(self):
+        with open(os.path.join(fixtures_dir, 'eid2011.crl'), 'rb') as f:
+            cert_list = crl.CertificateList.load(f.read())
+
+        index = cert_list.build_serial_index()
+        self.assertEqual(15752, len(index))
+        revoked = cert_list['tbs_cert_list']['revoked_certificates']
+        for position in (0, 100, 15751):
+            serial = revoked[position]['user_certificate'].native
+            self.assertEqual(position, index[serial])
+            self.assertTrue(cert_list.is_revoked(serial))
+        self.assertFalse(cert_list.is_revoked(-1))
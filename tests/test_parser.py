@@ -1,14 +1,20 @@
 # coding: utf-8
 from __future__ import unicode_literals, division, absolute_import, print_function
 
+import os
+import random
+import sys
 import unittest
 
-from asn1crypto import parser
+from asn1crypto import core, parser
 
 from ._unittest_compat import patch
 
 patch()
 
+tests_root = os.path.dirname(__file__)
+fixtures_dir = os.path.join(tests_root, 'fixtures')
+
 
 class ParserTests(unittest.TestCase):
 
@@ -151,3 +157,237 @@ class ParserTests(unittest.TestCase):
         with self.assertRaises(ValueError):
             # Should be b'\xbf\x1f\x00'
             parser.parse(b'\xbf\x80\x1f\x00')
+
+    def test_scan(self):
+        data = b'\x30\x80\x02\x01\x05\x30\x03\x04\x01\x00\x00\x00' + b'\x05\x00'
+        result = parser.scan(data)
+        self.assertEqual(7, len(result))
+        self.assertEqual(
+            [
+                (0, 0, 1, 16, 0, 2, 8),
+                (1, 0, 0, 2, 2, 4, 1),
+                (1, 0, 1, 16, 5, 7, 3),
+                (2, 0, 0, 4, 7, 9, 1),
+                (0, 0, 0, 5, 12, 14, 0),
+            ],
+            list(zip(*result))
+        )
+
+        result = parser.scan(data, max_depth=0)
+        self.assertEqual([0, 12], list(result[4]))
+
+    def test_scan_fixture(self):
+        with open(os.path.join(fixtures_dir, 'keys/test-der.crt'), 'rb') as f:
+            data = f.read()
+
+        expected = []
+
+        def walk(pointer, end, depth):
+            while pointer < end:
+                info, next_pointer = parser._parse(data, end, pointer)
+                contents_start = pointer + len(info[3])
+                expected.append((depth, info[0], info[1], info[2], pointer, contents_start, len(info[4])))
+                if info[1] == 1:
+                    walk(contents_start, contents_start + len(info[4]), depth + 1)
+                pointer = next_pointer
+
+        walk(0, len(data), 0)
+        self.assertEqual(expected, list(zip(*parser.scan(data))))
+
+    def test_scan_truncated(self):
+        with self.assertRaises(ValueError):
+            parser.scan(b'\x30\x05\x02\x01')
+        with self.assertRaises(ValueError):
+            parser.scan(b'\x30\x03\x02\x02\x00\x00')
+        with self.assertRaises(ValueError):
+            parser.scan(b'\x30\x80\x02\x01\x00')
+
+    def test_stream_parser(self):
+        data = b'\x02\x01\x00' + b'\x30\x82\x01\x04' + b'\x04\x82\x01\x00' + (b'\x01' * 256) + b'\x05\x00'
+        expected = [
+            parser.parse(b'\x02\x01\x00'),
+            parser.parse(data[3:-2]),
+            parser.parse(b'\x05\x00'),
+        ]
+
+        for chunk_size in (1, 2, 3, 7, 100, len(data)):
+            stream = parser.StreamParser()
+            results = []
+            for i in range(0, len(data), chunk_size):
+                results.extend(stream.feed(data[i:i + chunk_size]))
+            self.assertEqual(expected, results)
+            self.assertEqual(0, stream.pending)
+
+    def test_stream_parser_indef(self):
+        data = b'\x24\x80\x24\x80\x24\x80\x04\x00\x00\x00\x00\x00\x04\x01\x01\x00\x00' + b'\x02\x01\x05'
+        for chunk_size in (1, 2, 5):
+            stream = parser.StreamParser()
+            results = []
+            for i in range(0, len(data), chunk_size):
+                results.extend(stream.feed(data[i:i + chunk_size]))
+            self.assertEqual([parser.parse(data[:-3]), parser.parse(data[-3:])], results)
+
+    def test_stream_parser_partial(self):
+        stream = parser.StreamParser()
+        self.assertEqual([], stream.feed(b'\x30\x80\x02\x01'))
+        self.assertEqual(4, stream.pending)
+        self.assertEqual([], stream.feed(b'\x00\x00'))
+        result = stream.feed(b'\x00\x02')
+        self.assertEqual([(0, 1, 16, b'\x30\x80', b'\x02\x01\x00', b'\x00\x00')], result)
+        self.assertEqual(1, stream.pending)
+
+    def test_stream_parser_max_size(self):
+        stream = parser.StreamParser(max_size=10)
+        with self.assertRaises(ValueError):
+            stream.feed(b'\x04\x0b')
+
+        stream = parser.StreamParser(max_size=10)
+        with self.assertRaises(ValueError):
+            stream.feed(b'\x24\x80' + b'\x04\x02\x00\x00' * 3)
+
+    def test_stream_parser_errors(self):
+        with self.assertRaises(ValueError):
+            parser.StreamParser().feed(b'\x04\x80\x00\x00')
+        with self.assertRaises(ValueError):
+            parser.StreamParser().feed(b'\x1f\x04\x00')
+        with self.assertRaises(ValueError):
+            parser.StreamParser().feed(b'\x24\x80' * 12)
+
+    @unittest.skipIf(sys.version_info < (3, 5), 'asyncio streams require Python 3.5')
+    def test_read_tlv_async(self):
+        import asyncio
+
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        try:
+            reader = asyncio.StreamReader()
+            reader.feed_data(b'\x30\x80\x02\x01\x05\x00\x00')
+            reader.feed_data(b'\x02\x81\x01\x07')
+            reader.feed_eof()
+
+            result = loop.run_until_complete(parser.read_tlv_async(reader))
+            self.assertEqual((0, 1, 16, b'\x30\x80', b'\x02\x01\x05', b'\x00\x00'), result)
+
+            result = loop.run_until_complete(parser.read_tlv_async(reader, spec=core.Integer))
+            self.assertIsInstance(result, core.Integer)
+            self.assertEqual(7, result.native)
+
+            self.assertIsNone(loop.run_until_complete(parser.read_tlv_async(reader)))
+
+            reader = asyncio.StreamReader()
+            reader.feed_data(b'\x04\x01\xff')
+            reader.feed_eof()
+            with self.assertRaises(ValueError):
+                loop.run_until_complete(parser.read_tlv_async(reader, max_size=2))
+
+            reader = asyncio.StreamReader()
+            reader.feed_data(b'\x04\x05\x00')
+            reader.feed_eof()
+            with self.assertRaises(ValueError):
+                loop.run_until_complete(parser.read_tlv_async(reader))
+
+            # Cancelling the result stops the read, leaving later bytes unread
+            reader = asyncio.StreamReader()
+            reader.feed_data(b'\x04\x05\x00')
+            with self.assertRaises(asyncio.TimeoutError):
+                loop.run_until_complete(asyncio.wait_for(parser.read_tlv_async(reader), 0.01))
+            loop.run_until_complete(asyncio.sleep(0))
+            reader.feed_data(b'\x01\x02\x03\x04')
+            reader.feed_eof()
+            self.assertEqual(b'\x00\x01\x02\x03\x04', loop.run_until_complete(reader.read()))
+        finally:
+            asyncio.set_event_loop(None)
+            loop.close()
+
+
+def _call(func, *args, **kwargs):
+    """
+    Calls a parser function, returning the exception type and message
+    instead of raising, so implementations can be compared
+
+    :return:
+        The function's return value, or a 2-element tuple of exception class
+        and message
+    """
+
+    try:
+        return func(*args, **kwargs)
+    except (ValueError, TypeError) as e:
+        return (e.__class__, str(e))
+
+
+@unittest.skipIf(parser._speedups is None, 'asn1crypto._speedups is not compiled')
+class SpeedupsTests(unittest.TestCase):
+
+    def _compare_parse(self, data, pointer=0):
+        data_len = len(data)
+        expected = _call(parser._py_parse, data, data_len, pointer=pointer)
+        self.assertEqual(expected, _call(parser._speedups._parse, data, data_len, pointer=pointer))
+        self.assertEqual(
+            _call(parser._py_parse, data, data_len, pointer, True),
+            _call(parser._speedups._parse, data, data_len, pointer, True)
+        )
+        return expected
+
+    def _walk(self, data, depth=0):
+        pointer = 0
+        while pointer < len(data):
+            result = self._compare_parse(data, pointer)
+            if not isinstance(result[1], int):
+                return
+            info, pointer = result
+            if info[1] == 1 and depth < 20:
+                self._walk(info[4], depth + 1)
+
+    def test_parse_fixtures(self):
+        rand = random.Random(1)
+        for root, _, filenames in os.walk(fixtures_dir):
+            for filename in sorted(filenames):
+                with open(os.path.join(root, filename), 'rb') as f:
+                    data = f.read()
+                # Only the top level of the large CRL fixture is compared
+                # to keep the test fast
+                if len(data) > 65536:
+                    self._compare_parse(data)
+                else:
+                    self._walk(data)
+                    if sys.version_info >= (3,):
+                        self._walk(memoryview(data))
+                for _ in range(5):
+                    self._compare_parse(data[:rand.randint(0, len(data))])
+                if data:
+                    mutated = bytearray(data[:512])
+                    for _ in range(5):
+                        mutated[rand.randint(0, len(mutated) - 1)] = rand.randint(0, 255)
+                    self._walk(bytes(mutated))
+
+    def test_parse_edge_cases(self):
+        cases = [
+            b'',
+            b'\x02',
+            b'\x1f',
+            b'\x1f\x80\x01\x00',
+            b'\x1f\x04\x00',
+            b'\x1f\xff\xff\xff\xff\xff\xff\xff\xff\xff\xff\x7f\x00',
+            b'\x04\x80\x00\x00',
+            b'\x24\x80\x04\x00',
+            b'\x24\x80' * 12 + b'\x00\x00' * 12,
+            b'\x24\x80\x24\x80\x24\x80\x04\x00\x00\x00\x00\x00\x00\x00',
+            b'\x04\x82\x01',
+            b'\x04\x82\x01\x00',
+            b'\x04\x89\xff\xff\xff\xff\xff\xff\xff\xff\xff',
+            b'\x04\xff' + b'\xff' * 127,
+        ]
+        for data in cases:
+            self._compare_parse(data)
+
+    def test_dump_header(self):
+        for class_ in range(0, 4):
+            for method in (0, 1):
+                for tag in (0, 1, 16, 30, 31, 127, 128, 16383, 16384, 2 ** 40, 2 ** 70):
+                    for length in (0, 1, 127, 128, 255, 256, 65536):
+                        contents = b'\x00' * length
+                        header = parser._py_dump_header(class_, method, tag, contents)
+                        self.assertEqual(header, parser._speedups._dump_header(class_, method, tag, contents))
+                        self.assertEqual(header, parser._py_dump_header(class_, method, tag, length))
+                        self.assertEqual(header, parser._speedups._dump_header(class_, method, tag, length))
@@ -4,7 +4,7 @@ from __future__ import unicode_literals, division, absolute_import, print_functi
 import unittest
 import sys
 import os
-from datetime import datetime
+from datetime import datetime, timedelta
 
 from asn1crypto import x509, core, pem, util
 
@@ -445,6 +445,50 @@ class X509Tests(unittest.TestCase):
         else:
             self.assertNotEqual(general_name_1, general_name_2)
 
+    def test_ldap_string_prep(self):
+        value = x509.NameTypeAndValue()
+        self.assertEqual(' will  bond ', value._ldap_string_prep(' Will   Bond'))
+        self.assertEqual(' will  bond ', value._ldap_string_prep('Will\tBond\n'))
+        self.assertEqual(' école ', value._ldap_string_prep('École'))
+
+        self.assertIsNone(x509.NameTypeAndValue.cache_info())
+        x509.NameTypeAndValue.enable_cache()
+        try:
+            one = x509.Name.build({'country_name': 'US', 'common_name': 'Will Bond'})
+            two = x509.Name.build({'country_name': 'us', 'common_name': 'will  bond'})
+            self.assertEqual(one, two)
+            self.assertEqual(one.hashable, x509.Name.build({'country_name': 'US', 'common_name': 'Will Bond'}).hashable)
+            self.assertEqual({'hits': 2, 'misses': 4, 'size': 4, 'max_size': 4096}, x509.NameTypeAndValue.cache_info())
+        finally:
+            x509.NameTypeAndValue.disable_cache()
+        self.assertIsNone(x509.NameTypeAndValue.cache_info())
+
+        # Values that keep being prepared are not evicted
+        x509.NameTypeAndValue.enable_cache(max_size=2)
+        try:
+            for string in ('US', 'Will Bond', 'US', 'École', 'US'):
+                value._ldap_string_prep(string)
+            self.assertEqual({'hits': 2, 'misses': 3, 'size': 2, 'max_size': 2}, x509.NameTypeAndValue.cache_info())
+        finally:
+            x509.NameTypeAndValue.disable_cache()
+
+    def test_name_canonical_key(self):
+        utf8_name = x509.Name.build({'country_name': 'US', 'common_name': 'Will Bond'})
+        printable_name = x509.Name.build({'country_name': 'us', 'common_name': 'will  bond'}, use_printable=True)
+        self.assertNotEqual(utf8_name.dump(), printable_name.dump())
+        self.assertEqual(32, len(utf8_name.canonical_key))
+        self.assertEqual(utf8_name.canonical_key, printable_name.canonical_key)
+        self.assertNotEqual(
+            utf8_name.canonical_key,
+            x509.Name.build({'country_name': 'US', 'common_name': 'Will'}).canonical_key
+        )
+
+        root = self._load_cert('keys/test-der.crt')
+        inter = self._load_cert('keys/test-inter-der.crt')
+        self.assertEqual(root.subject_key_hash, root.issuer_key_hash)
+        self.assertEqual(root.subject_key_hash, inter.issuer_key_hash)
+        self.assertNotEqual(inter.subject_key_hash, inter.issuer_key_hash)
+
     def test_build_name_printable(self):
         utf8_name = x509.Name.build(
             {
@@ -3751,6 +3795,215 @@ class X509Tests(unittest.TestCase):
         self.assertEqual(cert.not_valid_after, datetime(2118, 1, 28, 12, 27, 39, tzinfo=util.timezone.utc))
         self.assertEqual(cert.not_valid_before, datetime(2018, 2, 21, 12, 27, 39, tzinfo=util.timezone.utc))
 
+    def test_filter_valid(self):
+        ders = [
+            self._load_cert('keys/test-der.crt').dump(),
+            self._load_cert('keys/test-validity.crt').dump(),
+        ]
+        # A not_after time with a fraction of a second is fully parsed
+        cert = self._load_cert('keys/test-der.crt')
+        cert['tbs_certificate']['validity']['not_after'] = x509.Time(
+            name='general_time',
+            value=datetime(2025, 5, 3, 14, 37, 16, 500000, tzinfo=util.timezone.utc)
+        )
+        ders.append(cert.dump())
+
+        utc = util.timezone.utc
+        self.assertEqual([False, False, False], x509.filter_valid(ders, at=datetime(2015, 1, 1, tzinfo=utc)))
+        self.assertEqual([True, False, True], x509.filter_valid(ders, at=datetime(2015, 5, 6, 14, 37, 16, tzinfo=utc)))
+        self.assertEqual([True, True, True], x509.filter_valid(ders, at=datetime(2025, 5, 3, 14, 37, 16, tzinfo=utc)))
+        self.assertEqual(
+            [False, True, True],
+            x509.filter_valid(ders, at=datetime(2025, 5, 3, 14, 37, 16, 1, tzinfo=utc))
+        )
+        self.assertEqual(
+            [False, True, False],
+            x509.filter_valid(ders, at=datetime(2025, 5, 3, 14, 37, 17, tzinfo=utc))
+        )
+        self.assertEqual(
+            [False, True, False],
+            x509.filter_valid(ders, at=datetime(2118, 1, 28, 20, 27, 39, tzinfo=util.timezone(timedelta(hours=8))))
+        )
+        self.assertEqual(
+            [False, False, False],
+            x509.filter_valid(ders, at=datetime(2118, 1, 28, 12, 27, 40, tzinfo=utc))
+        )
+        self.assertEqual([False, True, False], x509.filter_valid(ders))
+
+        with self.assertRaises(ValueError):
+            x509.filter_valid(ders, at=datetime(2020, 1, 1))
+
     def test_invalid_email_encoding(self):
         cert = self._load_cert("invalid_email_tag.pem")
         self.assertEqual('info@keyweb.de', cert.subject.native['email_address'])
+
+    def test_load_zero_copy(self):
+        with open(os.path.join(fixtures_dir, 'keys/test-der.crt'), 'rb') as f:
+            der = f.read()
+
+        cert = x509.Certificate.load(der, zero_copy=True)
+        self.assertEqual(x509.Certificate.load(der).native, cert.native)
+        if sys.version_info >= (3,):
+            self.assertIsInstance(cert['tbs_certificate']._contents, memoryview)
+            self.assertIsInstance(cert['tbs_certificate']['serial_number'].contents, bytes)
+        self.assertEqual(der, cert.dump())
+        self.assertEqual(der, cert.dump(force=True))
+
+    @unittest.skipIf(sys.version_info < (3,), 'memoryview parsing is only done on Python 3')
+    def test_load_memoryview(self):
+        with open(os.path.join(fixtures_dir, 'keys/test-der.crt'), 'rb') as f:
+            der = f.read()
+
+        cert = x509.Certificate.load(memoryview(der))
+        self.assertEqual(x509.Certificate.load(der).sha256, cert.sha256)
+        self.assertIsInstance(cert['tbs_certificate'].contents, bytes)
+
+    def test_native_reencodes_mutated_tree(self):
+        with open(os.path.join(fixtures_dir, 'keys/test-der.crt'), 'rb') as f:
+            der = f.read()
+
+        for zero_copy in (False, True):
+            cert = x509.Certificate.load(der, zero_copy=zero_copy)
+            tbs = cert['tbs_certificate']
+            tbs['subject'] = x509.Name.build({'common_name': 'Will Bond'})
+            self.assertEqual({'common_name': 'Will Bond'}, dict(cert.native['tbs_certificate']['subject']))
+            tbs.dump()
+            mutated = cert.dump()
+            self.assertEqual(cert.dump(force=True), mutated)
+
+    @data('extract_paths')
+    def extract(self, path):
+        with open(os.path.join(fixtures_dir, 'keys/test-der.crt'), 'rb') as f:
+            der = f.read()
+        cert = x509.Certificate.load(der)
+        expected = cert
+        for key in path.split('.'):
+            expected = expected[int(key) if key.lstrip('-').isdigit() else key]
+
+        value = x509.Certificate.extract(der, path)
+        self.assertEqual(expected.__class__, value.__class__)
+        self.assertEqual(expected.native, value.native)
+        if expected is core.VOID:
+            self.assertIsNone(x509.Certificate.extract(der, path, raw=True))
+        else:
+            self.assertEqual(expected.dump(), x509.Certificate.extract(der, path, raw=True))
+
+    @staticmethod
+    def extract_paths():
+        return (
+            ('tbs_certificate.subject',),
+            ('tbs_certificate.serial_number',),
+            ('tbs_certificate.version',),
+            ('tbs_certificate.issuer_unique_id',),
+            ('tbs_certificate.validity.not_after',),
+            ('tbs_certificate.extensions.0.extn_id',),
+            ('tbs_certificate.extensions.-1.extn_id',),
+            ('tbs_certificate.extensions.1.extn_value',),
+            ('tbs_certificate.subject_public_key_info.public_key',),
+            ('signature_algorithm.algorithm',),
+        )
+
+    def test_field_path(self):
+        with open(os.path.join(fixtures_dir, 'keys/test-der.crt'), 'rb') as f:
+            der = f.read()
+
+        path = core.FieldPath(x509.Certificate, ['tbs_certificate', 'extensions', 0])
+        self.assertEqual(
+            x509.Certificate.load(der)['tbs_certificate']['extensions'][0].dump(),
+            path.extract(der).dump()
+        )
+        view = memoryview(der) if sys.version_info >= (3,) else der
+        self.assertEqual(path.extract(der).native, path.extract(view).native)
+
+        # An absent field with a default value
+        critical = core.FieldPath(x509.Certificate, 'tbs_certificate.extensions.0.critical')
+        self.assertEqual(False, critical.extract(der).native)
+        self.assertIsNone(critical.extract(der, raw=True))
+
+        with self.assertRaises(KeyError):
+            core.FieldPath(x509.Certificate, 'tbs_certificate.foo')
+        with self.assertRaises(IndexError):
+            core.FieldPath(x509.Certificate, 'tbs_certificate.extensions.100').extract(der)
+        with self.assertRaises(TypeError):
+            core.FieldPath(x509.Certificate, 'tbs_certificate').extract('abc')
+
+        # The paths cached by extract() are bounded
+        max_size = core._FIELD_PATHS.max_size
+        for index in range(max_size + 10):
+            try:
+                x509.Certificate.extract(der, ['tbs_certificate', 'extensions', index])
+            except (IndexError):
+                pass
+        self.assertEqual(max_size, len(core._FIELD_PATHS))
+
+    def test_freeze(self):
+        with open(os.path.join(fixtures_dir, 'keys/test-der.crt'), 'rb') as f:
+            der = f.read()
+
+        cert = x509.Certificate.load(der)
+        self.assertIs(cert, cert.freeze())
+        self.assertEqual(x509.Certificate.load(der).native, cert.native)
+        self.assertIs(cert.native, cert.native)
+        self.assertEqual(der, cert.dump())
+        self.assertEqual(der, cert.dump(force=True))
+
+        tbs = cert['tbs_certificate']
+        with self.assertRaises(TypeError):
+            tbs['serial_number'] = 5
+        with self.assertRaises(TypeError):
+            del tbs['issuer_unique_id']
+        with self.assertRaises(TypeError):
+            tbs['extensions'].append({'extn_id': 'key_usage', 'extn_value': set(['digital_signature'])})
+        with self.assertRaises(TypeError):
+            tbs['subject'].chosen[0][0]['value'] = 'Test'
+        with self.assertRaises(TypeError):
+            tbs['extensions'][2]['extn_value'].parsed['ca'] = False
+
+        # Copies are not frozen
+        tbs_copy = tbs.copy()
+        tbs_copy['serial_number'] = 5
+        self.assertEqual(5, tbs_copy['serial_number'].native)
+        self.assertNotEqual(tbs.dump(), tbs_copy.dump())
+
+        # Only the value freeze() was called on keeps a copy of its encoding
+        self.assertIsNone(tbs._frozen_encoding)
+        if core._USE_SLOTS:
+            self.assertEqual({}, vars(cert))
+            self.assertEqual({}, vars(tbs['serial_number']))
+        self.assertEqual(x509.Certificate.load(der)['tbs_certificate'].dump(), tbs.dump())
+
+        # Pending mutations are encoded when freezing
+        cert = x509.Certificate.load(der)
+        cert['tbs_certificate']['serial_number'] = 5
+        cert['tbs_certificate']['subject'] = x509.Name.build({'common_name': 'Will Bond'})
+        cert.freeze()
+        self.assertEqual(cert.dump(force=True), cert.dump())
+        self.assertEqual(5, x509.Certificate.load(cert.dump())['tbs_certificate']['serial_number'].native)
+
+    def test_partial_field_parsing(self):
+        with open(os.path.join(fixtures_dir, 'keys/test-der.crt'), 'rb') as f:
+            der = f.read()
+
+        cert = x509.Certificate.load(der)
+        tbs = cert['tbs_certificate']
+        serial_number = tbs['serial_number']
+        self.assertEqual(13683582341504654466, serial_number.native)
+        # Only the version and serial number have been parsed
+        self.assertIsNone(tbs.children)
+        self.assertEqual(2, len(tbs._resume[0]))
+        if core._USE_SLOTS:
+            self.assertEqual({}, vars(tbs))
+        self.assertEqual(der, cert.dump())
+
+        # A mutated child of a partially parsed value is still encoded
+        validity = tbs['validity']
+        validity['not_after'] = x509.Time(name='utc_time', value=datetime(2040, 1, 1, tzinfo=util.timezone.utc))
+        self.assertIsNone(tbs.children)
+        self.assertEqual(x509.Certificate.load(cert.dump()).native, cert.native)
+        self.assertIs(serial_number, tbs['serial_number'])
+        self.assertIs(validity, tbs['validity'])
+        self.assertEqual(10, len(tbs))
+        self.assertIsNone(tbs._resume)
+
+        cert = x509.Certificate.load(der)
+        self.assertEqual(cert['signature_value'].native, cert[-1].native)